@@ -1,16 +1,18 @@
-import re
 import streamlit as st
+import streamlit.components.v1 as components
 st.set_page_config(page_title="Illinois Transportation Dashboard", page_icon="🔱", layout="wide")
 import pandas as pd
+import numpy as np
 import folium
 from streamlit_folium import folium_static
 from datetime import datetime
 import os
-import json
 import glob
-from PIL import Image
+import orjson
+from collections import ChainMap, defaultdict
 from pathlib import Path
 import altair as alt
+from build_av_map import build_av_map_html, classify_av_states, state_key
 
 # ─── Check pipeline data status (no auto-run) ────────────────────────
 def _check_pipeline():
@@ -28,8 +30,7 @@ def load_road_events(district_key):
     """Load road event cache for a district."""
     path = f"data/road/{district_key}.json"
     if os.path.exists(path):
-        with open(path) as f:
-            return json.load(f)
+        return orjson.loads(Path(path).read_bytes())
     return None
 
 def load_all_road_events():
@@ -37,25 +38,250 @@ def load_all_road_events():
     events = {}
     for path in sorted(glob.glob("data/road/*.json")):
         key = os.path.basename(path).replace(".json", "")
-        with open(path) as f:
-            events[key] = json.load(f)
+        events[key] = orjson.loads(Path(path).read_bytes())
     return events
 
 def load_members():
     """Load the canonical member roster."""
     if os.path.exists("members.json"):
-        with open("members.json") as f:
-            return json.load(f)
+        return orjson.loads(Path("members.json").read_bytes())
     return None
 
 def load_boundary(district_key):
     """Load GeoJSON boundary for a district."""
     path = f"data/boundaries/{district_key}.geojson"
     if os.path.exists(path):
-        with open(path) as f:
-            return json.load(f)
+        return orjson.loads(Path(path).read_bytes())
     return None
 
+@st.cache_data(ttl="1h", show_spinner=False)
+def district_images():
+    """File names in district_images/, listed once instead of stat-ing per rerun."""
+    try:
+        with os.scandir("district_images") as it:
+            return frozenset(e.name for e in it)
+    except FileNotFoundError:
+        return frozenset()
+
+@st.cache_data(ttl="1h", max_entries=16, show_spinner=False)
+def _load_json_cached(path, mtime):
+    return orjson.loads(Path(path).read_bytes())
+
+def load_json(path):
+    """Load a JSON data file, re-parsing it only when its mtime changes."""
+    return _load_json_cached(path, os.path.getmtime(path))
+
+@st.cache_data(ttl="60s", show_spinner=False)
+def _file_mtime(path):
+    """mtime of path, or None if it is missing (re-checked at most once a minute)."""
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return None
+
+def try_load_json(path):
+    """Like load_json, but returns None when the file has not been generated yet."""
+    mtime = _file_mtime(path)
+    if mtime is None:
+        return None
+    try:
+        return _load_json_cached(path, mtime)
+    except FileNotFoundError:
+        # Removed (or mid-regeneration) since the cached mtime was taken
+        return None
+
+# ─── Meeting memos ───────────────────────────────────────────────────
+HOUSE_MEMOS = [
+    ("IL-01", "Jonathan Jackson", "memo_IL-01_Jonathan_Jackson.docx"),
+    ("IL-02", "Robin Kelly", "memo_IL-02_Robin_Kelly.docx"),
+    ("IL-03", "Delia Ramirez", "memo_IL-03_Delia_Ramirez.docx"),
+    ("IL-04", "Jesús García", "memo_IL-04_Jesús_García.docx"),
+    ("IL-05", "Mike Quigley", "memo_IL-05_Mike_Quigley.docx"),
+    ("IL-06", "Sean Casten", "memo_IL-06_Sean_Casten.docx"),
+    ("IL-07", "Danny Davis", "memo_IL-07_Danny_Davis.docx"),
+    ("IL-08", "Raja Krishnamoorthi", "memo_IL-08_Raja_Krishnamoorthi.docx"),
+    ("IL-09", "Jan Schakowsky", "memo_IL-09_Jan_Schakowsky.docx"),
+    ("IL-10", "Brad Schneider", "memo_IL-10_Brad_Schneider.docx"),
+    ("IL-11", "Bill Foster", "memo_IL-11_Bill_Foster.docx"),
+    ("IL-12", "Mike Bost", "memo_IL-12_Mike_Bost.docx"),
+    ("IL-13", "Nikki Budzinski", "memo_IL-13_Nikki_Budzinski.docx"),
+    ("IL-14", "Lauren Underwood", "memo_IL-14_Lauren_Underwood.docx"),
+    ("IL-15", "Mary Miller", "memo_IL-15_Mary_Miller.docx"),
+    ("IL-16", "Darin LaHood", "memo_IL-16_Darin_LaHood.docx"),
+    ("IL-17", "Eric Sorensen", "memo_IL-17_Eric_Sorensen.docx"),
+]
+SENATE_MEMOS = [
+    ("Dick Durbin", "memo_Senator_Dick_Durbin.docx"),
+    ("Tammy Duckworth", "memo_Senator_Tammy_Duckworth.docx"),
+]
+
+def memo_files():
+    """Map each memo_*.docx in the working directory to its mtime (one directory scan)."""
+    with os.scandir(".") as it:
+        return {
+            e.name: e.stat().st_mtime
+            for e in it
+            if e.name.startswith("memo_") and e.name.endswith(".docx")
+        }
+
+@st.cache_resource(ttl="24h", max_entries=64, show_spinner=False)
+def _memo_bytes(path, mtime):
+    """Memo file contents; cache_resource hands back the same immutable bytes object every rerun."""
+    return Path(path).read_bytes()
+
+# ─── Cached tables & chart fragments ──────────────────────────────────
+MAJOR_PROGRAMS = frozenset({'National Highway Performance Program', 'Surface Transportation Grant Block Program',
+                            'Highway Safety Improvement Program', 'Bridge Formula'})
+
+@st.cache_data(ttl="1h", max_entries=4, show_spinner=False)
+def _district_allocation_tables(path, mtime):
+    """Build (display table, chart data) for the district formula allocations file."""
+    formula_data = _load_json_cached(path, mtime)
+    df = pd.DataFrame.from_dict(formula_data['district_allocations'], orient='index').sort_index()
+    millions = lambda col: (df[col] / 1e6).map('${:.1f}M'.format)
+    df_viz = pd.DataFrame({
+        'District': df.index,
+        'Representative': df['representative'],
+        'Type': df['type'].str.replace('_', ' ').str.title(),
+        'STBG': millions('stbg_formula'),
+        'NHPP': millions('nhpp_est'),
+        'HSIP': millions('hsip_est'),
+        'Bridge': millions('bridge_est'),
+        'Total': millions('total_formula_est'),
+        'Per Capita': df['per_capita'].map('${:.0f}'.format),
+        'Total_Num': df['total_formula_est'] / 1e6,
+        'PerCapita_Num': df['per_capita'],
+    }).reset_index(drop=True)
+    return df_viz.drop(columns=['Total_Num', 'PerCapita_Num']), df_viz
+
+@st.cache_data(ttl="1h", max_entries=4, show_spinner=False)
+def _myp_trend_frame(path, mtime):
+    """Long-form (FY, Program, Amount) frame of the major programs across FY 24-26."""
+    myp_data = _load_json_cached(path, mtime)
+    records = [
+        (fy, p['name'], p['base_apportionment'])
+        for fy in ('FY 24', 'FY 25', 'FY 26')
+        for p in myp_data[fy]['programs']
+        if p['base_apportionment'] and p['name'] in MAJOR_PROGRAMS
+    ]
+    return pd.DataFrame.from_records(records, columns=['FY', 'Program', 'Amount'])
+
+@st.cache_data(ttl="1h", max_entries=12, show_spinner=False)
+def _myp_program_tables(path, mtime, fy):
+    """(top-10 pie data, full formatted table) of one fiscal year's programs, largest first."""
+    myp_data = _load_json_cached(path, mtime)
+    progs = sorted(
+        ((p['name'], p['base_apportionment']) for p in myp_data[fy]['programs'] if p['base_apportionment']),
+        key=lambda x: x[1], reverse=True,
+    )
+    df_pie = pd.DataFrame.from_records(progs[:10], columns=['Program', 'Amount'])
+    prog_df = pd.DataFrame({'Program': [p[0] for p in progs], 'Amount': [f'${p[1]:,.0f}' for p in progs]})
+    return df_pie, prog_df
+
+@st.fragment
+def render_program_breakdown(path, mtime):
+    """Fiscal-year program pie and table; the FY selectbox reruns only this fragment."""
+    fy_sel = st.selectbox("Fiscal Year:", ['FY 24', 'FY 25', 'FY 26'])
+    
+    df_pie, prog_df = _myp_program_tables(path, mtime, fy_sel)
+    pie = alt.Chart(df_pie).mark_arc().encode(
+        theta='Amount:Q',
+        color='Program:N',
+        tooltip=['Program', alt.Tooltip('Amount:Q', format='$,.0f')]
+    ).properties(height=500)
+    st.altair_chart(pie, use_container_width=True)
+    
+    st.dataframe(prog_df, width='stretch', hide_index=True)
+
+@st.fragment
+def render_fy27_program_projections(program_projections):
+    """FY27 program table and top-5 chart; the scenario selectbox reruns only this fragment."""
+    scenario_choice = st.selectbox(
+        "Select Scenario:",
+        ["Flat Extension (CR)", "Inflation Adjusted (2.5%)", "House Markup (+3.5%)", 
+         "Senate Markup (+4%)", "Budget Constraints (-2%)"],
+        index=1
+    )
+    
+    prog_data_list = []
+    
+    valid_programs = [
+        'National Highway Performance Program',
+        'Surface Transportation Grant Block Program',
+        'Bridge Formula',
+        'Highway Safety Improvement Program',
+        'Congestion Mitigation & Air Quality Improvement Program',
+        'National Highway Freight Program',
+        'PROTECT Formula',
+        'Carbon Reduction Program',
+        'NEVI (Electric Vehicle) Formula',
+        'Metropolitan Planning',
+        'Appalachian Development Highway System'
+    ]
+    
+    for prog_name, prog_info in program_projections.items():
+        if not any(valid in prog_name for valid in valid_programs):
+            continue
+        
+        if prog_info['fy26_baseline'] > 0:
+            fy26_amt = prog_info['fy26_baseline']
+            fy27_amt = prog_info['scenarios'][scenario_choice]
+            change = fy27_amt - fy26_amt
+            
+            prog_data_list.append({
+                'Program': prog_name,
+                'FY26 Baseline': f'${fy26_amt/1e6:.1f}M',
+                'FY27 Projected': f'${fy27_amt/1e6:.1f}M',
+                'Change': f'${change/1e6:+.1f}M'
+            })
+    
+    prog_data_list.sort(key=lambda x: float(x['FY26 Baseline'].replace('$','').replace('M','')), reverse=True)
+    
+    st.dataframe(pd.DataFrame(prog_data_list[:15]), width='stretch', hide_index=True, height=500)
+    
+    st.markdown("#### Top 5 Programs Comparison")
+    
+    top5_data = []
+    for prog in prog_data_list[:5]:
+        top5_data.append({
+            'Program': prog['Program'][:30] + '...' if len(prog['Program']) > 30 else prog['Program'],
+            'FY26': float(prog['FY26 Baseline'].replace('$','').replace('M','')),
+            'FY27': float(prog['FY27 Projected'].replace('$','').replace('M',''))
+        })
+    
+    df_chart = pd.DataFrame(top5_data)
+    df_melted = df_chart.melt(id_vars=['Program'], var_name='Year', value_name='Amount')
+    
+    chart = alt.Chart(df_melted).mark_bar().encode(
+        x='Program:N',
+        y='Amount:Q',
+        color='Year:N',
+        xOffset='Year:N',
+        tooltip=['Program', 'Year', 'Amount']
+    ).properties(height=400)
+    
+    st.altair_chart(chart, use_container_width=True)
+
+def render_allocation_charts(df_viz):
+    """Total and per-capita allocation bar charts."""
+    st.markdown("### Total Allocation by District")
+    chart = alt.Chart(df_viz).mark_bar().encode(
+        x=alt.X('District:N', sort='-y'),
+        y=alt.Y('Total_Num:Q', title='Total Allocation ($M)'),
+        color='Type:N',
+        tooltip=['District', 'Representative', 'Type', 'Total']
+    ).properties(height=400)
+    st.altair_chart(chart, use_container_width=True)
+
+    st.markdown("### Per Capita Funding")
+    chart2 = alt.Chart(df_viz).mark_bar().encode(
+        x=alt.X('District:N', sort='-y'),
+        y=alt.Y('PerCapita_Num:Q', title='Per Capita ($)'),
+        color='Type:N',
+        tooltip=['District', 'Representative', 'Per Capita']
+    ).properties(height=400)
+    st.altair_chart(chart2, use_container_width=True)
+
 members_data = load_members()
 
 # ─── Sidebar Chatbot ──────────────────────────────────────────────────
@@ -99,8 +325,7 @@ def build_dashboard_context():
             for rf in sorted(road_files)[:20]:
                 key = os.path.basename(rf).replace(".json", "")
                 try:
-                    with open(rf) as f:
-                        rd = json.load(f)
+                    rd = orjson.loads(Path(rf).read_bytes())
                     counts = rd.get("counts", {})
                     ctx.append(f"  {key}: {rd.get('total',0)} events (closures={counts.get('closures',0)}, restrictions={counts.get('restrictions',0)}, construction={counts.get('construction',0)})")
                     for t in rd.get("top", [])[:3]:
@@ -129,139 +354,37 @@ def build_dashboard_context():
 
     return "\n".join(ctx)
 
-with st.sidebar:
-    st.markdown("### 🤖 IDOT AI Assistant")
-
-    # API key from secrets or manual input
-    api_key = None
-    if hasattr(st, "secrets") and "ANTHROPIC_API_KEY" in st.secrets:
-        api_key = st.secrets["ANTHROPIC_API_KEY"]
-    else:
-        api_key = st.text_input("Anthropic API Key", type="password", key="api_key_input")
-        if not api_key:
-            st.caption("Add your key here, or set `ANTHROPIC_API_KEY` in Streamlit secrets.")
-
-    # Initialize chat history
-    if "chat_messages" not in st.session_state:
-        st.session_state.chat_messages = []
-
-    # Display chat history
-    chat_container = st.container(height=400)
-    with chat_container:
-        for msg in st.session_state.chat_messages:
-            with st.chat_message(msg["role"]):
-                st.markdown(msg["content"])
-
-    # Chat input
-    if prompt := st.chat_input("Ask about IL transportation...", key="sidebar_chat"):
-        if not api_key:
-            st.warning("Please enter your Anthropic API key above.")
-        else:
-            # Add user message
-            st.session_state.chat_messages.append({"role": "user", "content": prompt})
-            with chat_container:
-                with st.chat_message("user"):
-                    st.markdown(prompt)
-
-            # Build system prompt with dashboard context
-            dashboard_context = build_dashboard_context()
-            system_prompt = f"""You are the IDOT AI Assistant, embedded in the Illinois Transportation Dashboard.
-You help users understand Illinois transportation data, policy, funding, and infrastructure.
-
-You have access to the following live dashboard data:
-
-{dashboard_context}
-
-Guidelines:
-- Be concise and specific. Reference actual data from the dashboard when relevant.
-- If asked about a specific district, reference the rep, closures, construction, and grants.
-- If asked about funding, reference IIJA allocations and discretionary grants.
-- If asked about legislation, reference tracked bills and IL General Assembly data.
-- If asked about something not in the data, say so honestly and provide general knowledge.
-- Keep answers focused and practical — this is a government/policy tool.
-- Format numbers with commas for readability.
-"""
-
-            # Call Claude API
-            try:
-                import anthropic
-                client = anthropic.Anthropic(api_key=api_key)
-
-                # Build messages (keep last 10 for context window)
-                messages = [
-                    {"role": m["role"], "content": m["content"]}
-                    for m in st.session_state.chat_messages[-10:]
-                ]
+def _context_signature():
+    """(path, mtime, size) of each data file build_dashboard_context reads.
 
-                with chat_container:
-                    with st.chat_message("assistant"):
-                        with st.spinner("Thinking..."):
-                            response = client.messages.create(
-                                model="claude-sonnet-4-20250514",
-                                max_tokens=1024,
-                                system=system_prompt,
-                                messages=messages,
-                            )
-                            reply = response.content[0].text
-                            st.markdown(reply)
+    Includes this file too, since DISTRICTS and build_dashboard_context's own
+    code shape the context and the persisted cache would otherwise outlive edits.
+    """
+    paths = [__file__, "members.json", *sorted(glob.glob("bills_*.json"))[-1:], *sorted(glob.glob("data/road/*.json"))[:20]]
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append((path, stat.st_mtime, stat.st_size))
+    return tuple(signature)
 
-                st.session_state.chat_messages.append({"role": "assistant", "content": reply})
+@st.cache_data(max_entries=4, show_spinner=False, persist="disk")
+def cached_dashboard_context(signature):
+    """build_dashboard_context(), rebuilt only when one of its source files changes.
 
-            except Exception as e:
-                error_msg = str(e)
-                if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
-                    st.error("❌ Invalid API key. Check your Anthropic API key.")
-                else:
-                    st.error(f"❌ Error: {error_msg}")
+    Persisted to disk so a restarted server reuses the context while neither
+    the data files nor app.py have changed.
+    """
+    return build_dashboard_context()
 
-    # Clear chat button
-    if st.session_state.chat_messages:
-        if st.button("🗑️ Clear Chat", key="clear_chat"):
-            st.session_state.chat_messages = []
-            st.rerun()
+@st.cache_data(show_spinner=False)
+def load_css(path):
+    """Read a stylesheet once per process, wrapped in a <style> tag."""
+    return f"<style>\n{Path(path).read_text()}</style>"
 
-st.markdown("""
-<style>
-    .preview-box {
-        background-color: #ffffff;
-        padding: 20px;
-        border-radius: 8px;
-        border-left: 5px solid #1f77b4;
-        margin: 15px 0;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        font-size: 15px;
-        line-height: 1.6;
-    }
-    .preview-box h4 {
-        margin-top: 0;
-        color: #1f77b4;
-        font-size: 18px;
-        font-weight: 600;
-    }
-    .preview-box p {
-        margin: 10px 0;
-        color: #333;
-    }
-    .preview-box strong {
-        color: #1f77b4;
-        font-weight: 600;
-    }
-    .preview-box a {
-        color: #1f77b4;
-        font-weight: 600;
-        text-decoration: none;
-        font-size: 16px;
-    }
-    .preview-box a:hover {
-        text-decoration: underline;
-    }
-    .district-ref-image {
-        border: 2px solid #ddd;
-        border-radius: 8px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-</style>
-""", unsafe_allow_html=True)
+st.html(load_css("style.css"))
 
 st.markdown('<div style="font-size: 2.5rem; font-weight: 700; color: #1f77b4; text-align: center;">🚗 IDOT Ultimate Dashboard</div>', unsafe_allow_html=True)
 st.markdown("---")
@@ -271,8 +394,7 @@ def load_real_bills():
     files = glob.glob("bills_*.json")
     if files:
         latest = sorted(files)[-1]
-        with open(latest, 'r') as f:
-            return json.load(f)
+        return orjson.loads(Path(latest).read_bytes())
     return {}
 
 real_bills_data = load_real_bills()
@@ -284,14 +406,23 @@ else:
     DISTRICT_BOUNDARIES = {}
 
 # Load dynamic IDOT data if available
+@st.cache_data(ttl="1h", max_entries=2, show_spinner=False)
+def _idot_event_lists(path, mtime):
+    """Per-district closures/construction lists from an IDOT export; other keys are dropped."""
+    data = orjson.loads(Path(path).read_bytes())
+    return {
+        dist: {key: payload[key] for key in ("closures", "construction") if key in payload}
+        for dist, payload in data.items()
+        if isinstance(payload, dict)
+    }
+
 def load_idot_data():
     """Load IDOT construction/closure data from JSON if available"""
     try:
         idot_files = glob.glob("idot_dynamic_*.json")
         if idot_files:
             latest = sorted(idot_files)[-1]
-            with open(latest, 'r') as f:
-                return json.load(f)
+            return _idot_event_lists(latest, os.path.getmtime(latest))
     except:
         pass
     return {}
@@ -441,6 +572,235 @@ DISTRICTS = {
     },
 }
 
+# ─── District geometry (float32, built once per process) ─────────────
+@st.cache_resource(show_spinner=False)
+def _district_rings():
+    """Outer boundary ring of each district as a float32 (N, 2) array in [lat, lon] order."""
+    rings = {}
+    for district_id, info in DISTRICTS.items():
+        if district_id in DISTRICT_BOUNDARIES:
+            coords = DISTRICT_BOUNDARIES[district_id]['geometry']['coordinates'][0]
+            rings[district_id] = np.asarray(coords, dtype=np.float32)[:, ::-1]
+        else:
+            rings[district_id] = np.asarray(info.get('boundary', []), dtype=np.float32).reshape(-1, 2)
+    return rings
+
+def _coords_list(arr):
+    """Convert a coordinate array to nested lists, rounded to 5 decimals (~1 m)."""
+    return arr.astype(np.float64).round(5).tolist()
+
+# ─── Statewide map (rendered once per process) ───────────────────────
+@st.cache_resource(show_spinner=False)
+def _statewide_map_html():
+    """Render the Statewide Map to HTML, with all district polygons in one GeoJSON layer."""
+    rings = _district_rings()
+    features = []
+    for district_id, info in DISTRICTS.items():
+        coords = _coords_list(rings[district_id][:, ::-1])
+        features.append({
+            "type": "Feature",
+            "properties": {
+                "name": f"{district_id}: {info['rep']} ({info['party']})",
+                "area": info['area'],
+                "party": info['party'],
+            },
+            "geometry": {"type": "Polygon", "coordinates": [coords]},
+        })
+
+    m = folium.Map(location=[40.0, -89.0], zoom_start=7)
+
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        style_function=lambda f: {
+            "color": '#4A90E2' if f['properties']['party'] == 'D' else '#E24A4A',
+            "fillColor": '#4A90E2' if f['properties']['party'] == 'D' else '#E24A4A',
+            "fillOpacity": 0.15,
+            "weight": 2,
+        },
+        popup=folium.GeoJsonPopup(fields=["name", "area"], labels=False),
+    ).add_to(m)
+
+    # One Icon per style, shared by every marker on this map
+    party_icons = {
+        'D': folium.Icon(color='blue', icon='info-sign'),
+        'R': folium.Icon(color='red', icon='info-sign'),
+    }
+
+    for district_id, info in DISTRICTS.items():
+        n_closures = len(info.get('closures', []))
+        grant_total = sum(g['amount'] for g in info.get('grants', []))
+
+        popup = f"<b>{district_id}: {info['rep']} ({info['party']})</b><br>{info['area']}<br><br>🚧 Closures: {n_closures}<br>💰 Grants: ${grant_total:,}"
+
+        folium.Marker(
+            [info['lat'], info['lon']],
+            popup=folium.Popup(popup, max_width=300),
+            tooltip=f"{district_id}: {info['rep']}",
+            icon=party_icons['D' if info['party'] == 'D' else 'R']
+        ).add_to(m)
+
+        for closure in info.get('closures', []):
+            folium.CircleMarker([closure['lat'], closure['lon']], radius=6, color='orange', fill=True, popup=f"🚧 {closure['route']}").add_to(m)
+
+        for grant in info.get('grants', []):
+            folium.CircleMarker([grant['lat'], grant['lon']], radius=8, color='green', fill=True, popup=f"💰 ${grant['amount']:,}").add_to(m)
+
+    return folium.Figure().add_child(m).render()
+
+# ─── AV Policy map (pre-rendered by build_av_map.py) ─────────────────
+@st.cache_data(ttl="1h", max_entries=4, show_spinner=False)
+def _load_av_states(path, mtime):
+    """NCSL records split into passed/active once per data change, not per rerun."""
+    return classify_av_states(_load_json_cached(path, mtime))
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _av_map_html(passed_key, active_key):
+    return build_av_map_html(passed_key, active_key)
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _static_av_map_html(path, mtime):
+    return Path(path).read_text()
+
+# ─── District View preview boxes ─────────────────────────────────────
+PREVIEW_TEMPLATES = {
+    'closure': """
+<div class="preview-box">
+    <h4>🚧 {route} - {location}</h4>
+    <p><strong>Type:</strong> {type}</p>
+    <p><strong>Status:</strong> {status}</p>
+    <p><strong>Description:</strong> {description}</p>
+    <p><a href="{url}" target="_blank">🔗 View Source</a></p>
+</div>
+""",
+    'construction': """
+<div class="preview-box">
+    <h4>🏗️ {route} - {location}</h4>
+    <p><strong>Type:</strong> {type}</p>
+    <p><strong>Status:</strong> {status}</p>
+    <p><strong>Budget:</strong> {budget}</p>
+    <p><strong>Timeline:</strong> {timeline}</p>
+    <p><strong>Description:</strong> {description}</p>
+    <p><a href="{url}" target="_blank">🔗 View Project Details</a></p>
+</div>
+""",
+    'grant': """
+<div class="preview-box">
+    <h4>💰 {program}: ${amount:,}</h4>
+    <p><strong>Project:</strong> {project}</p>
+    <p><strong>Description:</strong> {description}</p>
+    <p><a href="{url}" target="_blank">🔗 View Program Details</a></p>
+</div>
+""",
+    'bill': """
+<div class="preview-box">
+    <h4>📜 {number}</h4>
+    <p><strong>Title:</strong> {title}</p>
+    <p><strong>Relationship:</strong> {relationship}</p>
+    <p><a href="{url}" target="_blank">🔗 View on Congress.gov</a></p>
+</div>
+""",
+}
+
+def render_preview(kind, items, defaults=None):
+    """Show the preview box for the selected item if it belongs to `kind`. Missing fields render as N/A."""
+    selected = st.session_state.selected_item
+    if selected and selected[0] == kind and selected[1] < len(items):
+        item = items[selected[1]]
+        fields = defaultdict(lambda: 'N/A', defaults(item) if defaults else {})
+        fields.update(item)
+        st.markdown(PREVIEW_TEMPLATES[kind].format_map(fields), unsafe_allow_html=True)
+
+with st.sidebar:
+    st.markdown("### 🤖 IDOT AI Assistant")
+
+    # API key from secrets or manual input
+    api_key = None
+    if hasattr(st, "secrets") and "ANTHROPIC_API_KEY" in st.secrets:
+        api_key = st.secrets["ANTHROPIC_API_KEY"]
+    else:
+        api_key = st.text_input("Anthropic API Key", type="password", key="api_key_input")
+        if not api_key:
+            st.caption("Add your key here, or set `ANTHROPIC_API_KEY` in Streamlit secrets.")
+
+    # Initialize chat history
+    if "chat_messages" not in st.session_state:
+        st.session_state.chat_messages = []
+
+    # Display chat history
+    chat_container = st.container(height=400)
+    with chat_container:
+        for msg in st.session_state.chat_messages:
+            with st.chat_message(msg["role"]):
+                st.markdown(msg["content"])
+
+    # Chat input
+    if prompt := st.chat_input("Ask about IL transportation...", key="sidebar_chat"):
+        if not api_key:
+            st.warning("Please enter your Anthropic API key above.")
+        else:
+            # Add user message
+            st.session_state.chat_messages.append({"role": "user", "content": prompt})
+            with chat_container:
+                with st.chat_message("user"):
+                    st.markdown(prompt)
+
+            # Build system prompt with dashboard context
+            dashboard_context = cached_dashboard_context(_context_signature())
+            system_prompt = f"""You are the IDOT AI Assistant, embedded in the Illinois Transportation Dashboard.
+You help users understand Illinois transportation data, policy, funding, and infrastructure.
+
+You have access to the following live dashboard data:
+
+{dashboard_context}
+
+Guidelines:
+- Be concise and specific. Reference actual data from the dashboard when relevant.
+- If asked about a specific district, reference the rep, closures, construction, and grants.
+- If asked about funding, reference IIJA allocations and discretionary grants.
+- If asked about legislation, reference tracked bills and IL General Assembly data.
+- If asked about something not in the data, say so honestly and provide general knowledge.
+- Keep answers focused and practical — this is a government/policy tool.
+- Format numbers with commas for readability.
+"""
+
+            # Call Claude API
+            try:
+                import anthropic
+                client = anthropic.Anthropic(api_key=api_key)
+
+                # Build messages (keep last 10 for context window)
+                messages = [
+                    {"role": m["role"], "content": m["content"]}
+                    for m in st.session_state.chat_messages[-10:]
+                ]
+
+                with chat_container:
+                    with st.chat_message("assistant"):
+                        with st.spinner("Thinking..."):
+                            response = client.messages.create(
+                                model="claude-sonnet-4-20250514",
+                                max_tokens=1024,
+                                system=system_prompt,
+                                messages=messages,
+                            )
+                            reply = response.content[0].text
+                            st.markdown(reply)
+
+                st.session_state.chat_messages.append({"role": "assistant", "content": reply})
+
+            except Exception as e:
+                error_msg = str(e)
+                if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
+                    st.error("❌ Invalid API key. Check your Anthropic API key.")
+                else:
+                    st.error(f"❌ Error: {error_msg}")
+
+    # Clear chat button
+    if st.session_state.chat_messages:
+        if st.button("🗑️ Clear Chat", key="clear_chat"):
+            st.session_state.chat_messages = []
+            st.rerun()
+
 # Session state
 if 'selected_district' not in st.session_state:
     st.session_state.selected_district = None
@@ -487,48 +847,8 @@ if view == "🗺️ Statewide Map":
         st.caption("💰 Grants Secured: $85M+")
         st.caption("📍 Committees: Armed Services, Commerce")
 
-    # Create map with ALL district boundaries
-    m = folium.Map(location=[40.0, -89.0], zoom_start=7)
-    
-    for district_id, info in DISTRICTS.items():
-        color = '#4A90E2' if info['party'] == 'D' else '#E24A4A'
-        
-        if district_id in DISTRICT_BOUNDARIES:
-            boundary_data = DISTRICT_BOUNDARIES[district_id]
-            coords = boundary_data['geometry']['coordinates'][0]
-            folium_coords = [[lat, lon] for lon, lat in coords]
-        else:
-            folium_coords = info.get('boundary', [])
-        
-        folium.Polygon(
-            locations=folium_coords,
-            color=color,
-            fill=True,
-            fillColor=color,
-            fillOpacity=0.15,
-            weight=2,
-            popup=f"<b>{district_id}: {info['rep']} ({info['party']})</b><br>{info['area']}"
-        ).add_to(m)
-        
-        n_closures = len(info.get('closures', []))
-        grant_total = sum(g['amount'] for g in info.get('grants', []))
-        
-        popup = f"<b>{district_id}: {info['rep']} ({info['party']})</b><br>{info['area']}<br><br>🚧 Closures: {n_closures}<br>💰 Grants: ${grant_total:,}"
-        
-        folium.Marker(
-            [info['lat'], info['lon']],
-            popup=folium.Popup(popup, max_width=300),
-            tooltip=f"{district_id}: {info['rep']}",
-            icon=folium.Icon(color='blue' if info['party'] == 'D' else 'red', icon='info-sign')
-        ).add_to(m)
-        
-        for closure in info.get('closures', []):
-            folium.CircleMarker([closure['lat'], closure['lon']], radius=6, color='orange', fill=True, popup=f"🚧 {closure['route']}").add_to(m)
-        
-        for grant in info.get('grants', []):
-            folium.CircleMarker([grant['lat'], grant['lon']], radius=8, color='green', fill=True, popup=f"💰 ${grant['amount']:,}").add_to(m)
-    
-    folium_static(m, width=1400, height=600)
+    # Map with ALL district boundaries (same sizing as folium_static)
+    components.html(_statewide_map_html(), width=1400, height=610)
     
     st.caption("ℹ️ Hover over markers for district info. Popups show details on click. Use the buttons below to jump to a district.")
     
@@ -572,13 +892,15 @@ elif view == "📍 District View":
     
     if st.session_state.selected_district:
         district = st.session_state.selected_district
-        info = DISTRICTS[district].copy()
-        
-        # Merge in live IDOT data if available
-        if district in idot_live_data:
-            live_data = idot_live_data[district]
-            info['closures'] = info.get('closures', []) + live_data.get('closures', [])
-            info['construction'] = info.get('construction', []) + live_data.get('construction', [])
+        info = DISTRICTS[district]
+
+        # Overlay live IDOT data if available (only the merged lists are new)
+        live_data = idot_live_data.get(district)
+        if live_data:
+            info = ChainMap({
+                'closures': info.get('closures', []) + live_data.get('closures', []),
+                'construction': info.get('construction', []) + live_data.get('construction', []),
+            }, info)
         
         col_info, col_map_ref = st.columns([2, 1])
         
@@ -588,10 +910,8 @@ elif view == "📍 District View":
             st.markdown(f"**Committees:** {', '.join(info['committees'])}")
         
         with col_map_ref:
-            img_path = f'district_images/{district}.png'
-            if os.path.exists(img_path):
-                img = Image.open(img_path)
-                st.image(img, caption=f"{district} Location", use_container_width=True)
+            if f"{district}.png" in district_images():
+                st.image(f"district_images/{district}.png", caption=f"{district} Location", use_container_width=True)
             else:
                 st.info("📍 Reference map coming soon")
         
@@ -607,18 +927,13 @@ elif view == "📍 District View":
         st.markdown("---")
         
         # District map
+        ring = _district_rings()[district]
         if district in DISTRICT_BOUNDARIES:
-            boundary_data = DISTRICT_BOUNDARIES[district]
-            coords = boundary_data['geometry']['coordinates'][0]
-            lons = [c[0] for c in coords]
-            lats = [c[1] for c in coords]
-            center_lat = sum(lats) / len(lats)
-            center_lon = sum(lons) / len(lons)
-            folium_coords = [[lat, lon] for lon, lat in coords]
+            center_lat, center_lon = ring.mean(axis=0).tolist()
         else:
             center_lat = info['lat']
             center_lon = info['lon']
-            folium_coords = info.get('boundary', [])
+        folium_coords = _coords_list(ring)
         
         dm = folium.Map(location=[center_lat, center_lon], zoom_start=10)
         
@@ -633,11 +948,15 @@ elif view == "📍 District View":
             popup=f"<b>{district} Boundary</b>"
         ).add_to(dm)
         
+        # Icons are shared across markers, but only within this one map
+        road_icon = folium.Icon(color='orange', icon='road', prefix='fa')
+        dollar_icon = folium.Icon(color='green', icon='dollar', prefix='fa')
+
         for closure in info.get('closures', []):
-            folium.Marker([closure['lat'], closure['lon']], icon=folium.Icon(color='orange', icon='road', prefix='fa'), popup=f"🚧 {closure['route']}").add_to(dm)
+            folium.Marker([closure['lat'], closure['lon']], icon=road_icon, popup=f"🚧 {closure['route']}").add_to(dm)
         
         for grant in info.get('grants', []):
-            folium.Marker([grant['lat'], grant['lon']], icon=folium.Icon(color='green', icon='dollar', prefix='fa'), popup=f"💰 ${grant['amount']:,}").add_to(dm)
+            folium.Marker([grant['lat'], grant['lon']], icon=dollar_icon, popup=f"💰 ${grant['amount']:,}").add_to(dm)
         
         folium_static(dm, width=1400, height=500)
         
@@ -653,19 +972,7 @@ elif view == "📍 District View":
                     if st.button(f"🚧 {closure['route']} - {closure['location']} ({closure['status']})", key=f"closure_{idx}", use_container_width=True):
                         st.session_state.selected_item = ('closure', idx)
                 
-                if st.session_state.selected_item and st.session_state.selected_item[0] == 'closure':
-                    idx = st.session_state.selected_item[1]
-                    if idx < len(info['closures']):
-                        c = info['closures'][idx]
-                        st.markdown(f"""
-                        <div class="preview-box">
-                            <h4>🚧 {c['route']} - {c['location']}</h4>
-                            <p><strong>Type:</strong> {c['type']}</p>
-                            <p><strong>Status:</strong> {c['status']}</p>
-                            <p><strong>Description:</strong> {c['description']}</p>
-                            <p><a href="{c['url']}" target="_blank">🔗 View Source</a></p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                render_preview('closure', info['closures'])
             else:
                 st.info("No active closures")
         
@@ -676,21 +983,7 @@ elif view == "📍 District View":
                     if st.button(f"🏗️ {construction['route']} - {construction['location']} ({construction['status']})", key=f"construction_{idx}", use_container_width=True):
                         st.session_state.selected_item = ('construction', idx)
                 
-                if st.session_state.selected_item and st.session_state.selected_item[0] == 'construction':
-                    idx = st.session_state.selected_item[1]
-                    if idx < len(info['construction']):
-                        c = info['construction'][idx]
-                        st.markdown(f"""
-                        <div class="preview-box">
-                            <h4>🏗️ {c['route']} - {c['location']}</h4>
-                            <p><strong>Type:</strong> {c['type']}</p>
-                            <p><strong>Status:</strong> {c['status']}</p>
-                            <p><strong>Budget:</strong> {c.get('budget', 'N/A')}</p>
-                            <p><strong>Timeline:</strong> {c.get('timeline', 'N/A')}</p>
-                            <p><strong>Description:</strong> {c['description']}</p>
-                            <p><a href="{c['url']}" target="_blank">🔗 View Project Details</a></p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                render_preview('construction', info['construction'])
             else:
                 st.info("No active construction projects")
         
@@ -701,18 +994,7 @@ elif view == "📍 District View":
                     if st.button(f"💰 {grant['program']}: ${grant['amount']:,} - {grant['project']}", key=f"grant_{idx}", use_container_width=True):
                         st.session_state.selected_item = ('grant', idx)
                 
-                if st.session_state.selected_item and st.session_state.selected_item[0] == 'grant':
-                    idx = st.session_state.selected_item[1]
-                    if idx < len(info['grants']):
-                        g = info['grants'][idx]
-                        st.markdown(f"""
-                        <div class="preview-box">
-                            <h4>💰 {g['program']}: ${g['amount']:,}</h4>
-                            <p><strong>Project:</strong> {g['project']}</p>
-                            <p><strong>Description:</strong> {g['description']}</p>
-                            <p><a href="{g['url']}" target="_blank">🔗 View Program Details</a></p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                render_preview('grant', info['grants'])
             else:
                 st.info("No grants")
         
@@ -723,19 +1005,10 @@ elif view == "📍 District View":
                     if st.button(f"📜 {bill.get('number', 'N/A')} - {bill.get('title', 'No title')[:80]}...", key=f"bill_{idx}", use_container_width=True):
                         st.session_state.selected_item = ('bill', idx)
                 
-                if st.session_state.selected_item and st.session_state.selected_item[0] == 'bill':
-                    idx = st.session_state.selected_item[1]
-                    if idx < len(district_bills):
-                        b = district_bills[idx]
-                        bill_url = b.get('url', f"https://www.congress.gov/search?q={b.get('number', '')}")
-                        st.markdown(f"""
-                        <div class="preview-box">
-                            <h4>📜 {b.get('number', 'N/A')}</h4>
-                            <p><strong>Title:</strong> {b.get('title', 'No title')}</p>
-                            <p><strong>Relationship:</strong> {b.get('relationship', 'Unknown')}</p>
-                            <p><a href="{bill_url}" target="_blank">🔗 View on Congress.gov</a></p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                render_preview('bill', district_bills, lambda b: {
+                    'title': 'No title', 'relationship': 'Unknown',
+                    'url': f"https://www.congress.gov/search?q={b.get('number', '')}",
+                })
             else:
                 st.info("No bills tracked (run get_bills.py to fetch)")
     else:
@@ -754,40 +1027,21 @@ elif view == "📝 Meeting Memos":
     
     st.markdown("### House Members")
     
-    house_memos = [
-        ("IL-01", "Jonathan Jackson", "memo_IL-01_Jonathan_Jackson.docx"),
-        ("IL-02", "Robin Kelly", "memo_IL-02_Robin_Kelly.docx"),
-        ("IL-03", "Delia Ramirez", "memo_IL-03_Delia_Ramirez.docx"),
-        ("IL-04", "Jesús García", "memo_IL-04_Jesús_García.docx"),
-        ("IL-05", "Mike Quigley", "memo_IL-05_Mike_Quigley.docx"),
-        ("IL-06", "Sean Casten", "memo_IL-06_Sean_Casten.docx"),
-        ("IL-07", "Danny Davis", "memo_IL-07_Danny_Davis.docx"),
-        ("IL-08", "Raja Krishnamoorthi", "memo_IL-08_Raja_Krishnamoorthi.docx"),
-        ("IL-09", "Jan Schakowsky", "memo_IL-09_Jan_Schakowsky.docx"),
-        ("IL-10", "Brad Schneider", "memo_IL-10_Brad_Schneider.docx"),
-        ("IL-11", "Bill Foster", "memo_IL-11_Bill_Foster.docx"),
-        ("IL-12", "Mike Bost", "memo_IL-12_Mike_Bost.docx"),
-        ("IL-13", "Nikki Budzinski", "memo_IL-13_Nikki_Budzinski.docx"),
-        ("IL-14", "Lauren Underwood", "memo_IL-14_Lauren_Underwood.docx"),
-        ("IL-15", "Mary Miller", "memo_IL-15_Mary_Miller.docx"),
-        ("IL-16", "Darin LaHood", "memo_IL-16_Darin_LaHood.docx"),
-        ("IL-17", "Eric Sorensen", "memo_IL-17_Eric_Sorensen.docx"),
-    ]
+    memos = memo_files()
     
     cols = st.columns(3)
-    for idx, (district, name, filename) in enumerate(house_memos):
+    for idx, (district, name, filename) in enumerate(HOUSE_MEMOS):
         col = cols[idx % 3]
         with col:
             st.markdown(f"**{district}**: {name}")
-            if os.path.exists(filename):
-                with open(filename, 'rb') as f:
-                    st.download_button(
-                        label=f"📄 Download Memo",
-                        data=f,
-                        file_name=filename,
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        key=f"memo_{district}"
-                    )
+            if filename in memos:
+                st.download_button(
+                    label=f"📄 Download Memo",
+                    data=_memo_bytes(filename, memos[filename]),
+                    file_name=filename,
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                    key=f"memo_{district}"
+                )
             else:
                 st.caption("⚠️ Memo file not found")
     
@@ -796,24 +1050,18 @@ elif view == "📝 Meeting Memos":
     
     col1, col2 = st.columns(2)
     
-    senate_memos = [
-        ("Dick Durbin", "memo_Senator_Dick_Durbin.docx"),
-        ("Tammy Duckworth", "memo_Senator_Tammy_Duckworth.docx"),
-    ]
-    
-    for idx, (name, filename) in enumerate(senate_memos):
+    for idx, (name, filename) in enumerate(SENATE_MEMOS):
         col = col1 if idx == 0 else col2
         with col:
             st.markdown(f"**Senator {name}**")
-            if os.path.exists(filename):
-                with open(filename, 'rb') as f:
-                    st.download_button(
-                        label=f"📄 Download Memo",
-                        data=f,
-                        file_name=filename,
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        key=f"memo_sen_{idx}"
-                    )
+            if filename in memos:
+                st.download_button(
+                    label=f"📄 Download Memo",
+                    data=_memo_bytes(filename, memos[filename]),
+                    file_name=filename,
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                    key=f"memo_sen_{idx}"
+                )
             else:
                 st.caption("⚠️ Memo file not found")
 
@@ -948,11 +1196,11 @@ elif view == "🛣️ Live Road Events":
                 if boundary:
                     geom = boundary.get("geometry", {})
                     if geom.get("type") == "Polygon":
-                        coords = [[c[1], c[0]] for c in geom["coordinates"][0]]
+                        coords = _coords_list(np.asarray(geom["coordinates"][0], dtype=np.float32)[:, ::-1])
                         folium.Polygon(coords, color="#4A90E2", fill=True, fillOpacity=0.1, weight=2).add_to(m)
                     elif geom.get("type") == "MultiPolygon":
                         for poly in geom["coordinates"]:
-                            coords = [[c[1], c[0]] for c in poly[0]]
+                            coords = _coords_list(np.asarray(poly[0], dtype=np.float32)[:, ::-1])
                             folium.Polygon(coords, color="#4A90E2", fill=True, fillOpacity=0.1, weight=2).add_to(m)
 
                 for event in events_with_coords[:50]:
@@ -1036,12 +1284,11 @@ elif view == "🛣️ Live Road Events":
 elif view == "💰 Federal Funding":
     st.header("💰 Federal Funding Overview - Illinois IIJA Highway Apportionments")
     
-    try:
-        with open('myp_funding_data.json', 'r') as f:
-            myp_data = json.load(f)
-    except:
+    myp_data = try_load_json('myp_funding_data.json')
+    if myp_data is None:
         st.error("⚠️ MYP funding data not found")
         st.stop()
+    myp_mtime = _file_mtime('myp_funding_data.json')
     
     st.markdown("### Multi-Year Funding Summary (FY 2024-2026)")
     
@@ -1062,20 +1309,7 @@ elif view == "💰 Federal Funding":
     with tab1:
         st.subheader("Major Programs Over Time")
         
-        major_programs = ['National Highway Performance Program', 'Surface Transportation Grant Block Program', 
-                         'Highway Safety Improvement Program', 'Bridge Formula']
-        
-        trend_data = []
-        for fy in ['FY 24', 'FY 25', 'FY 26']:
-            for prog in myp_data[fy]['programs']:
-                if prog['name'] in major_programs and prog['base_apportionment']:
-                    trend_data.append({
-                        'FY': fy,
-                        'Program': prog['name'],
-                        'Amount': prog['base_apportionment']
-                    })
-        
-        df = pd.DataFrame(trend_data)
+        df = _myp_trend_frame('myp_funding_data.json', myp_mtime)
         chart = alt.Chart(df).mark_line(point=True).encode(
             x='FY:N',
             y=alt.Y('Amount:Q', axis=alt.Axis(format='$,.0f')),
@@ -1087,43 +1321,17 @@ elif view == "💰 Federal Funding":
     with tab2:
         st.subheader("Program Breakdown")
         
-        fy_sel = st.selectbox("Fiscal Year:", ['FY 24', 'FY 25', 'FY 26'])
-        
-        progs = [(p['name'], p['base_apportionment']) for p in myp_data[fy_sel]['programs'] 
-                 if p['base_apportionment']]
-        progs.sort(key=lambda x: x[1], reverse=True)
-        
-        df_pie = pd.DataFrame(progs[:10], columns=['Program', 'Amount'])
-        pie = alt.Chart(df_pie).mark_arc().encode(
-            theta='Amount:Q',
-            color='Program:N',
-            tooltip=['Program', alt.Tooltip('Amount:Q', format='$,.0f')]
-        ).properties(height=500)
-        st.altair_chart(pie, use_container_width=True)
-        
-        prog_df = pd.DataFrame([{'Program': p[0], 'Amount': f'${p[1]:,.0f}'} for p in progs])
-        st.dataframe(prog_df, width='stretch', hide_index=True)
+        render_program_breakdown('myp_funding_data.json', myp_mtime)
     
     with tab3:
         st.subheader("District Formula Allocations")
         
-        try:
-            with open('district_formula_allocations.json', 'r') as f:
-                formula_data = json.load(f)
-            
-            district_details = []
-            for dist, alloc in sorted(formula_data['district_allocations'].items()):
-                district_details.append({
-                    'District': dist,
-                    'Representative': alloc['representative'],
-                    'STBG': f"${alloc['stbg_formula']/1e6:.1f}M",
-                    'NHPP': f"${alloc['nhpp_est']/1e6:.1f}M",
-                    'Total': f"${alloc['total_formula_est']/1e6:.1f}M",
-                    'Per Capita': f"${alloc['per_capita']:.0f}"
-                })
-            
-            st.dataframe(pd.DataFrame(district_details), width='stretch', hide_index=True, height=600)
-        except:
+        formula_mtime = _file_mtime('district_formula_allocations.json')
+        if formula_mtime is not None:
+            df_details, _ = _district_allocation_tables('district_formula_allocations.json', formula_mtime)
+            st.dataframe(df_details[['District', 'Representative', 'STBG', 'NHPP', 'Total', 'Per Capita']],
+                         width='stretch', hide_index=True, height=600)
+        else:
             st.warning("⚠️ Run district allocation calculator for detailed breakdown")
 
 
@@ -1131,14 +1339,12 @@ elif view == "💰 Federal Funding":
 elif view == "📊 AI Analysis":
     st.header("📊 AI-Powered Funding Analysis & Insights")
     
-    analysis_files = glob.glob('comprehensive_analysis_*.json')
-    if not analysis_files:
+    latest = max(glob.iglob('comprehensive_analysis_*.json'), key=os.path.getmtime, default=None)
+    if latest is None:
         st.error("⚠️ No analysis found. Run: python3 ai_comprehensive_analysis.py")
         st.stop()
     
-    latest = sorted(analysis_files)[-1]
-    with open(latest, 'r') as f:
-        report = json.load(f)
+    report = load_json(latest)
     
     st.markdown(f"**Generated:** {report['metadata']['generated'][:19]}")
     st.markdown("---")
@@ -1190,10 +1396,8 @@ elif view == "📊 AI Analysis":
     with tab3:
         st.subheader("District Formula Allocations (FY 2026)")
         
-        try:
-            with open('district_formula_allocations.json', 'r') as f:
-                formula_data = json.load(f)
-            
+        formula_data = try_load_json('district_formula_allocations.json')
+        if formula_data is not None:
             st.success("✅ Formula calculations loaded - showing all federal programs")
             
             col1, col2, col3, col4 = st.columns(4)
@@ -1205,46 +1409,14 @@ elif view == "📊 AI Analysis":
             
             st.markdown("---")
             
-            district_details = []
-            for dist, alloc in sorted(formula_data['district_allocations'].items()):
-                district_details.append({
-                    'District': dist,
-                    'Representative': alloc['representative'],
-                    'Type': alloc['type'].replace('_', ' ').title(),
-                    'STBG': f"${alloc['stbg_formula']/1e6:.1f}M",
-                    'NHPP': f"${alloc['nhpp_est']/1e6:.1f}M",
-                    'HSIP': f"${alloc['hsip_est']/1e6:.1f}M",
-                    'Bridge': f"${alloc['bridge_est']/1e6:.1f}M",
-                    'Total': f"${alloc['total_formula_est']/1e6:.1f}M",
-                    'Per Capita': f"${alloc['per_capita']:.0f}"
-                })
-            
-            st.dataframe(pd.DataFrame(district_details), use_container_width=True, hide_index=True, height=600)
-            
-            st.markdown("### Total Allocation by District")
-            df_viz = pd.DataFrame(district_details)
-            df_viz['Total_Num'] = df_viz['Total'].str.replace('$','').str.replace('M','').astype(float)
-            
-            chart = alt.Chart(df_viz).mark_bar().encode(
-                x=alt.X('District:N', sort='-y'),
-                y=alt.Y('Total_Num:Q', title='Total Allocation ($M)'),
-                color='Type:N',
-                tooltip=['District', 'Representative', 'Type', 'Total']
-            ).properties(height=400)
-            st.altair_chart(chart, use_container_width=True)
-            
-            st.markdown("### Per Capita Funding")
-            df_viz['PerCapita_Num'] = df_viz['Per Capita'].str.replace('$','').astype(float)
-            
-            chart2 = alt.Chart(df_viz).mark_bar().encode(
-                x=alt.X('District:N', sort='-y'),
-                y=alt.Y('PerCapita_Num:Q', title='Per Capita ($)'),
-                color='Type:N',
-                tooltip=['District', 'Representative', 'Per Capita']
-            ).properties(height=400)
-            st.altair_chart(chart2, use_container_width=True)
+            df_details, df_viz = _district_allocation_tables(
+                'district_formula_allocations.json',
+                _file_mtime('district_formula_allocations.json'),
+            )
+            st.dataframe(df_details, use_container_width=True, hide_index=True, height=600)
+            render_allocation_charts(df_viz)
             
-        except FileNotFoundError:
+        else:
             st.warning("⚠️ Run: python3 calculate_district_formulas.py to generate detailed allocations")
             district_data = []
             for dist, alloc in sorted(report['district_allocations'].items()):
@@ -1281,10 +1453,8 @@ elif view == "📊 AI Analysis":
 elif view == "🏛️ IL General Assembly":
     st.header("🏛️ Illinois General Assembly Transportation Tracker")
     
-    try:
-        with open('illinois_general_assembly.json', 'r') as f:
-            ilga_data = json.load(f)
-        
+    ilga_data = try_load_json('illinois_general_assembly.json')
+    if ilga_data is not None:
         st.markdown(f"### 104th General Assembly (2025-2026)")
         
         col1, col2, col3 = st.columns(3)
@@ -1312,7 +1482,7 @@ elif view == "🏛️ IL General Assembly":
             st.subheader("Key Transportation Committee Members")
             st.info("Coming soon: Full legislator directory with district overlap analysis")
     
-    except:
+    else:
         st.error("⚠️ Illinois GA data not loaded. Run: python3 scrape_ilga.py")
 
 
@@ -1322,17 +1492,11 @@ elif view == "🤖 AV Policy":
     
     av_states = {'passed': {}, 'active': {}}
     
-    try:
-        with open('ncsl_av_complete.json', 'r') as f:
-            ncsl_data = json.load(f)
-            
-        for state_name, state_info in ncsl_data.get('states', {}).items():
-            if state_info.get('type') != 'No Legislation' and state_info.get('year') != 'N/A':
-                av_states['passed'][state_name] = state_info
-    except FileNotFoundError:
+    ncsl_mtime = _file_mtime('ncsl_av_complete.json')
+    if ncsl_mtime is None:
         st.warning("⚠️ NCSL AV data file not found. Showing empty tracker.")
-    except Exception as e:
-        st.error(f"Error loading AV data: {e}")
+    else:
+        av_states = _load_av_states('ncsl_av_complete.json', ncsl_mtime)
     
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("🔵 Laws Passed", len(av_states['passed']))
@@ -1345,54 +1509,12 @@ elif view == "🤖 AV Policy":
     st.subheader("Interactive 50-State Map")
     st.markdown("**🔵 Blue** = Laws Passed | **🟠 Orange** = Active Legislation | **⚪ Gray** = No Activity")
     
-    state_coords = {
-        'Alabama': [32.8067, -86.7911], 'Alaska': [61.3707, -152.4044], 'Arizona': [33.7298, -111.4312],
-        'Arkansas': [34.9697, -92.3731], 'California': [36.1162, -119.6816], 'Colorado': [39.0598, -105.3111],
-        'Connecticut': [41.5978, -72.7554], 'Delaware': [39.3185, -75.5071], 'Florida': [27.7663, -81.6868],
-        'Georgia': [33.0406, -83.6431], 'Hawaii': [21.0943, -157.4983], 'Idaho': [44.2405, -114.4788],
-        'Illinois': [40.3495, -88.9861], 'Indiana': [39.8494, -86.2583], 'Iowa': [42.0115, -93.2105],
-        'Kansas': [38.5266, -96.7265], 'Kentucky': [37.6681, -84.6701], 'Louisiana': [31.1695, -91.8678],
-        'Maine': [44.6939, -69.3819], 'Maryland': [39.0639, -76.8021], 'Massachusetts': [42.2302, -71.5301],
-        'Michigan': [43.3266, -84.5361], 'Minnesota': [45.6945, -93.9002], 'Mississippi': [32.7416, -89.6787],
-        'Missouri': [38.4561, -92.2884], 'Montana': [46.9219, -110.4544], 'Nebraska': [41.1254, -98.2681],
-        'Nevada': [38.3135, -117.0554], 'New Hampshire': [43.4525, -71.5639], 'New Jersey': [40.2989, -74.5210],
-        'New Mexico': [34.8405, -106.2485], 'New York': [42.1657, -74.9481], 'North Carolina': [35.6301, -79.8064],
-        'North Dakota': [47.5289, -99.7840], 'Ohio': [40.3888, -82.7649], 'Oklahoma': [35.5653, -96.9289],
-        'Oregon': [44.5720, -122.0709], 'Pennsylvania': [40.5908, -77.2098], 'Rhode Island': [41.6809, -71.5118],
-        'South Carolina': [33.8569, -80.9450], 'South Dakota': [44.2998, -99.4388], 'Tennessee': [35.7478, -86.6923],
-        'Texas': [31.0545, -97.5635], 'Utah': [40.1500, -111.8624], 'Vermont': [44.0459, -72.7107],
-        'Virginia': [37.7693, -78.1700], 'Washington': [47.4009, -121.4905], 'West Virginia': [38.4912, -80.9545],
-        'Wisconsin': [44.2685, -89.6165], 'Wyoming': [42.7559, -107.3025]
-    }
-    
-    m = folium.Map(location=[39.8283, -98.5795], zoom_start=4, tiles='CartoDB positron')
-    
-    for state, coords in state_coords.items():
-        if state in av_states['passed']:
-            color = 'blue'
-            status_info = av_states['passed'][state]
-            status_text = f"<b>✅ PASSED ({status_info['year']})</b><br>{status_info['type']}<br>{status_info['status']}"
-        elif state in av_states['active']:
-            color = 'orange'
-            status_info = av_states['active'][state]
-            status_text = f"<b>🟠 PENDING ({status_info['year']})</b><br>{status_info['type']}<br>{status_info['status']}"
-        else:
-            color = 'gray'
-            status_text = "<b>⚪ NO ACTIVITY</b><br>No AV legislation"
-        
-        folium.CircleMarker(
-            location=coords,
-            radius=8 if state in av_states['passed'] or state in av_states['active'] else 4,
-            popup=folium.Popup(f"<b>{state}</b><br>{status_text}", max_width=250),
-            tooltip=state,
-            color=color,
-            fill=True,
-            fillColor=color,
-            fillOpacity=0.7 if state in av_states['passed'] or state in av_states['active'] else 0.3,
-            weight=2
-        ).add_to(m)
-    
-    folium_static(m, width=1400, height=600)
+    static_mtime = _file_mtime('av_map.html')
+    if ncsl_mtime is not None and static_mtime is not None and static_mtime >= ncsl_mtime:
+        av_map_html = _static_av_map_html('av_map.html', static_mtime)
+    else:
+        av_map_html = _av_map_html(state_key(av_states['passed']), state_key(av_states['active']))
+    components.html(av_map_html, width=1400, height=610)
     
     st.markdown("---")
     
@@ -1529,10 +1651,8 @@ elif view == "🤖 AV Policy":
 elif view == "🔮 FY27 Projections":
     st.header("🔮 FY 2027 Appropriations Projections")
     
-    try:
-        with open('fy27_appropriations_projections.json', 'r') as f:
-            proj_data = json.load(f)
-    except:
+    proj_data = try_load_json('fy27_appropriations_projections.json')
+    if proj_data is None:
         st.error("⚠️ Run: python3 analyze_appropriations_fy27.py")
         st.stop()
     
@@ -1607,72 +1727,7 @@ elif view == "🔮 FY27 Projections":
     st.markdown("### Program-by-Program FY27 Projections")
     
     if 'program_projections' in proj_data:
-        
-        scenario_choice = st.selectbox(
-            "Select Scenario:",
-            ["Flat Extension (CR)", "Inflation Adjusted (2.5%)", "House Markup (+3.5%)", 
-             "Senate Markup (+4%)", "Budget Constraints (-2%)"],
-            index=1
-        )
-        
-        prog_data_list = []
-        
-        valid_programs = [
-            'National Highway Performance Program',
-            'Surface Transportation Grant Block Program',
-            'Bridge Formula',
-            'Highway Safety Improvement Program',
-            'Congestion Mitigation & Air Quality Improvement Program',
-            'National Highway Freight Program',
-            'PROTECT Formula',
-            'Carbon Reduction Program',
-            'NEVI (Electric Vehicle) Formula',
-            'Metropolitan Planning',
-            'Appalachian Development Highway System'
-        ]
-        
-        for prog_name, prog_info in proj_data['program_projections'].items():
-            if not any(valid in prog_name for valid in valid_programs):
-                continue
-            
-            if prog_info['fy26_baseline'] > 0:
-                fy26_amt = prog_info['fy26_baseline']
-                fy27_amt = prog_info['scenarios'][scenario_choice]
-                change = fy27_amt - fy26_amt
-                
-                prog_data_list.append({
-                    'Program': prog_name,
-                    'FY26 Baseline': f'${fy26_amt/1e6:.1f}M',
-                    'FY27 Projected': f'${fy27_amt/1e6:.1f}M',
-                    'Change': f'${change/1e6:+.1f}M'
-                })
-        
-        prog_data_list.sort(key=lambda x: float(x['FY26 Baseline'].replace('$','').replace('M','')), reverse=True)
-        
-        st.dataframe(pd.DataFrame(prog_data_list[:15]), width='stretch', hide_index=True, height=500)
-        
-        st.markdown("#### Top 5 Programs Comparison")
-        
-        top5_data = []
-        for prog in prog_data_list[:5]:
-            top5_data.append({
-                'Program': prog['Program'][:30] + '...' if len(prog['Program']) > 30 else prog['Program'],
-                'FY26': float(prog['FY26 Baseline'].replace('$','').replace('M','')),
-                'FY27': float(prog['FY27 Projected'].replace('$','').replace('M',''))
-            })
-        
-        df_chart = pd.DataFrame(top5_data)
-        df_melted = df_chart.melt(id_vars=['Program'], var_name='Year', value_name='Amount')
-        
-        chart = alt.Chart(df_melted).mark_bar().encode(
-            x='Program:N',
-            y='Amount:Q',
-            color='Year:N',
-            xOffset='Year:N',
-            tooltip=['Program', 'Year', 'Amount']
-        ).properties(height=400)
-        
-        st.altair_chart(chart, use_container_width=True)
+        render_fy27_program_projections(proj_data['program_projections'])
     else:
         st.warning("Program-level projections not available. Run analysis script.")
 
@@ -1681,10 +1736,8 @@ elif view == "🔮 FY27 Projections":
 elif view == "💎 Discretionary Grants":
     st.header("💎 Discretionary Grants - Competitive Federal Awards")
     
-    try:
-        with open('discretionary_grants.json', 'r') as f:
-            grants_data = json.load(f)
-    except:
+    grants_data = try_load_json('discretionary_grants.json')
+    if grants_data is None:
         st.error("⚠️ Run: python3 create_discretionary_grants.py")
         st.stop()
     
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+build_av_map.py — Pre-render the AV Policy 50-state map to static HTML.
+
+Input:  ncsl_av_complete.json
+Output: av_map.html
+
+app.py serves av_map.html as-is while it is newer than the NCSL data, and
+renders the same map in-process (via build_av_map_html) when it is stale or
+missing. Full setup (setup_pipeline.py) runs this; re-run it after updating
+ncsl_av_complete.json.
+"""
+
+import json
+import sys
+
+import folium
+
+NCSL_PATH = "ncsl_av_complete.json"
+OUT_PATH = "av_map.html"
+
+STATE_COORDS = {
+    'Alabama': [32.8067, -86.7911], 'Alaska': [61.3707, -152.4044], 'Arizona': [33.7298, -111.4312],
+    'Arkansas': [34.9697, -92.3731], 'California': [36.1162, -119.6816], 'Colorado': [39.0598, -105.3111],
+    'Connecticut': [41.5978, -72.7554], 'Delaware': [39.3185, -75.5071], 'Florida': [27.7663, -81.6868],
+    'Georgia': [33.0406, -83.6431], 'Hawaii': [21.0943, -157.4983], 'Idaho': [44.2405, -114.4788],
+    'Illinois': [40.3495, -88.9861], 'Indiana': [39.8494, -86.2583], 'Iowa': [42.0115, -93.2105],
+    'Kansas': [38.5266, -96.7265], 'Kentucky': [37.6681, -84.6701], 'Louisiana': [31.1695, -91.8678],
+    'Maine': [44.6939, -69.3819], 'Maryland': [39.0639, -76.8021], 'Massachusetts': [42.2302, -71.5301],
+    'Michigan': [43.3266, -84.5361], 'Minnesota': [45.6945, -93.9002], 'Mississippi': [32.7416, -89.6787],
+    'Missouri': [38.4561, -92.2884], 'Montana': [46.9219, -110.4544], 'Nebraska': [41.1254, -98.2681],
+    'Nevada': [38.3135, -117.0554], 'New Hampshire': [43.4525, -71.5639], 'New Jersey': [40.2989, -74.5210],
+    'New Mexico': [34.8405, -106.2485], 'New York': [42.1657, -74.9481], 'North Carolina': [35.6301, -79.8064],
+    'North Dakota': [47.5289, -99.7840], 'Ohio': [40.3888, -82.7649], 'Oklahoma': [35.5653, -96.9289],
+    'Oregon': [44.5720, -122.0709], 'Pennsylvania': [40.5908, -77.2098], 'Rhode Island': [41.6809, -71.5118],
+    'South Carolina': [33.8569, -80.9450], 'South Dakota': [44.2998, -99.4388], 'Tennessee': [35.7478, -86.6923],
+    'Texas': [31.0545, -97.5635], 'Utah': [40.1500, -111.8624], 'Vermont': [44.0459, -72.7107],
+    'Virginia': [37.7693, -78.1700], 'Washington': [47.4009, -121.4905], 'West Virginia': [38.4912, -80.9545],
+    'Wisconsin': [44.2685, -89.6165], 'Wyoming': [42.7559, -107.3025]
+}
+
+
+def classify_av_states(ncsl_data):
+    """Split NCSL state records into {'passed': {...}, 'active': {...}}."""
+    av_states = {'passed': {}, 'active': {}}
+    for state_name, state_info in ncsl_data.get('states', {}).items():
+        if state_info.get('type') != 'No Legislation' and state_info.get('year') != 'N/A':
+            av_states['passed'][state_name] = state_info
+    return av_states
+
+
+def state_key(states):
+    """Hashable, order-independent snapshot of a passed/active state dict."""
+    return tuple(sorted((state, info['year'], info['type'], info['status']) for state, info in states.items()))
+
+
+def build_av_map_html(passed_key, active_key):
+    """Render the 50-state AV map; keys come from state_key()."""
+    passed = {state: f"<b>✅ PASSED ({year})</b><br>{law_type}<br>{status}"
+              for state, year, law_type, status in passed_key}
+    active = {state: f"<b>🟠 PENDING ({year})</b><br>{law_type}<br>{status}"
+              for state, year, law_type, status in active_key}
+
+    m = folium.Map(location=[39.8283, -98.5795], zoom_start=4, tiles='CartoDB positron')
+
+    for state, coords in STATE_COORDS.items():
+        status_text = passed.get(state)
+        if status_text is not None:
+            color = 'blue'
+        else:
+            status_text = active.get(state)
+            color = 'orange' if status_text is not None else 'gray'
+
+        has_activity = status_text is not None
+        if not has_activity:
+            status_text = "<b>⚪ NO ACTIVITY</b><br>No AV legislation"
+
+        folium.CircleMarker(
+            location=coords,
+            radius=8 if has_activity else 4,
+            popup=folium.Popup(f"<b>{state}</b><br>{status_text}", max_width=250),
+            tooltip=state,
+            color=color,
+            fill=True,
+            fillColor=color,
+            fillOpacity=0.7 if has_activity else 0.3,
+            weight=2
+        ).add_to(m)
+
+    return folium.Figure().add_child(m).render()
+
+
+def main():
+    try:
+        with open(NCSL_PATH) as f:
+            ncsl_data = json.load(f)
+    except FileNotFoundError:
+        print(f"❌ {NCSL_PATH} not found")
+        sys.exit(1)
+
+    av_states = classify_av_states(ncsl_data)
+    html = build_av_map_html(state_key(av_states['passed']), state_key(av_states['active']))
+    with open(OUT_PATH, "w") as f:
+        f.write(html)
+
+    print(f"✅ {OUT_PATH}: {len(av_states['passed'])} passed, {len(av_states['active'])} active")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,14 @@ Sources:
 Output: data/boundaries/{district_key}.geojson
 """
 
-import json
 import os
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 OUT_DIR = "data/boundaries"
 os.makedirs(OUT_DIR, exist_ok=True)
@@ -53,35 +56,48 @@ CENSUS_SLDU_GEOJSON = (
     "https://www2.census.gov/geo/tiger/GENZ2023/shp/cb_2023_17_sldu_500k.zip"
 )
 
+# One pooled session for all queries (keep-alive across the Census/Esri hosts),
+# retrying throttled or transient 5xx responses with backoff
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
 
-def fetch_arcgis_geojson(url, where_clause, out_fields="*", max_records=200):
-    """Query an ArcGIS FeatureServer and return GeoJSON features."""
+
+def fetch_arcgis_geojson(url, where_clause, log, out_fields="*", max_records=200):
+    """Query an ArcGIS FeatureServer and return GeoJSON features. Errors go to log."""
     params = {
         "where": where_clause,
         "outFields": out_fields,
         "outSR": "4326",
         "f": "geojson",
         "resultRecordCount": max_records,
-        "returnGeometry": "true"
+        "returnGeometry": "true",
+        # Display-quality geometry: 5 decimals (~1 m) and ~10 m generalization
+        "geometryPrecision": 5,
+        "maxAllowableOffset": 0.0001,
     }
     try:
-        resp = requests.get(url, params=params, timeout=60)
+        resp = _SESSION.get(url, params=params, timeout=60)
         resp.raise_for_status()
         data = resp.json()
         return data.get("features", [])
     except Exception as e:
-        print(f"  ⚠️  ArcGIS query failed: {e}")
+        log.append(f"  ⚠️  ArcGIS query failed: {e}")
         return []
 
 
-def fetch_congressional():
-    """Fetch IL congressional district boundaries (119th Congress)."""
-    print("\n📍 Fetching Congressional District boundaries...")
+def fetch_congressional(log):
+    """Fetch IL congressional district boundaries (119th Congress), logging to log."""
+    log.append("\n📍 Fetching Congressional District boundaries...")
 
     # Try the Esri Living Atlas service first
     features = fetch_arcgis_geojson(
         CONGRESS_URL,
         where_clause="STATE_ABBR='IL'",
+        log=log,
         out_fields="DISTRICTID,NAME,PARTY,STATE_ABBR,CDFIPS",
         max_records=20
     )
@@ -95,15 +111,16 @@ def fetch_congressional():
         features = fetch_arcgis_geojson(
             alt_url,
             where_clause="STATE_ABBR='IL'",
+            log=log,
             out_fields="*",
             max_records=20
         )
 
     if not features:
-        print("  ❌ Could not fetch congressional boundaries from ArcGIS.")
-        print("  💡 Fallback: download manually from Census Bureau:")
-        print(f"     {CENSUS_CD_GEOJSON}")
-        print("     Then convert with: python convert_shp_to_geojson.py")
+        log.append("  ❌ Could not fetch congressional boundaries from ArcGIS.")
+        log.append("  💡 Fallback: download manually from Census Bureau:")
+        log.append(f"     {CENSUS_CD_GEOJSON}")
+        log.append("     Then convert with: python convert_shp_to_geojson.py")
         return 0
 
     count = 0
@@ -138,21 +155,21 @@ def fetch_congressional():
             "geometry": feat.get("geometry")
         }
 
-        with open(out_path, "w") as f:
-            json.dump(geojson, f)
+        Path(out_path).write_bytes(orjson.dumps(geojson))
         count += 1
-        print(f"  ✅ {key}")
+        log.append(f"  ✅ {key}")
 
     return count
 
 
-def fetch_il_house():
-    """Fetch IL House district boundaries."""
-    print("\n📍 Fetching IL House District boundaries...")
+def fetch_il_house(log):
+    """Fetch IL House district boundaries, logging to log."""
+    log.append("\n📍 Fetching IL House District boundaries...")
 
     features = fetch_arcgis_geojson(
         IL_HOUSE_URL,
         where_clause="STATE='17'",
+        log=log,
         out_fields="*",
         max_records=200
     )
@@ -166,13 +183,14 @@ def fetch_il_house():
         features = fetch_arcgis_geojson(
             alt_url,
             where_clause="STATE='17'",
+            log=log,
             out_fields="*",
             max_records=200
         )
 
     if not features:
-        print("  ❌ Could not fetch IL House boundaries.")
-        print(f"  💡 Download manually: {CENSUS_SLDL_GEOJSON}")
+        log.append("  ❌ Could not fetch IL House boundaries.")
+        log.append(f"  💡 Download manually: {CENSUS_SLDL_GEOJSON}")
         return 0
 
     count = 0
@@ -205,21 +223,21 @@ def fetch_il_house():
             "geometry": feat.get("geometry")
         }
 
-        with open(out_path, "w") as f:
-            json.dump(geojson, f)
+        Path(out_path).write_bytes(orjson.dumps(geojson))
         count += 1
 
-    print(f"  ✅ {count} IL House districts saved")
+    log.append(f"  ✅ {count} IL House districts saved")
     return count
 
 
-def fetch_il_senate():
-    """Fetch IL Senate district boundaries."""
-    print("\n📍 Fetching IL Senate District boundaries...")
+def fetch_il_senate(log):
+    """Fetch IL Senate district boundaries, logging to log."""
+    log.append("\n📍 Fetching IL Senate District boundaries...")
 
     features = fetch_arcgis_geojson(
         IL_SENATE_URL,
         where_clause="STATE='17'",
+        log=log,
         out_fields="*",
         max_records=100
     )
@@ -232,13 +250,14 @@ def fetch_il_senate():
         features = fetch_arcgis_geojson(
             alt_url,
             where_clause="STATE='17'",
+            log=log,
             out_fields="*",
             max_records=100
         )
 
     if not features:
-        print("  ❌ Could not fetch IL Senate boundaries.")
-        print(f"  💡 Download manually: {CENSUS_SLDU_GEOJSON}")
+        log.append("  ❌ Could not fetch IL Senate boundaries.")
+        log.append(f"  💡 Download manually: {CENSUS_SLDU_GEOJSON}")
         return 0
 
     count = 0
@@ -271,11 +290,10 @@ def fetch_il_senate():
             "geometry": feat.get("geometry")
         }
 
-        with open(out_path, "w") as f:
-            json.dump(geojson, f)
+        Path(out_path).write_bytes(orjson.dumps(geojson))
         count += 1
 
-    print(f"  ✅ {count} IL Senate districts saved")
+    log.append(f"  ✅ {count} IL Senate districts saved")
     return count
 
 
@@ -284,11 +302,18 @@ def main():
     print("IDOT Dashboard — Boundary Fetcher")
     print("=" * 60)
 
-    cd_count = fetch_congressional()
-    time.sleep(1)
-    house_count = fetch_il_house()
-    time.sleep(1)
-    senate_count = fetch_il_senate()
+    # The three geographies live on independent services; fetch them
+    # concurrently, each buffering its output so it prints in one block
+    cd_log, house_log, senate_log = [], [], []
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        cd_future = pool.submit(fetch_congressional, cd_log)
+        house_future = pool.submit(fetch_il_house, house_log)
+        senate_future = pool.submit(fetch_il_senate, senate_log)
+    cd_count = cd_future.result()
+    house_count = house_future.result()
+    senate_count = senate_future.result()
+    for log in (cd_log, house_log, senate_log):
+        print("\n".join(log))
 
     print("\n" + "=" * 60)
     print("SUMMARY")
@@ -8,10 +8,14 @@ IDOT ArcGIS Open Data layers:
   - Road Closures (points)
   - Road Restrictions (points — obstructions)
 
-For each district boundary in data/boundaries/, we query each layer using
-esriSpatialRelIntersects, normalize results, and write:
+Each layer is fetched once for the whole state, indexed with a shapely
+STRtree, and matched against every district boundary in data/boundaries/
+locally. Results are normalized and written to:
   data/road/{district_key}.json
 
+A single-district run skips the statewide fetch and asks the server to do the
+esriSpatialRelIntersects query for that one boundary instead.
+
 Also builds: data/road/US-IL-SEN.json (statewide top-5 aggregate)
 
 Usage:
@@ -22,24 +26,38 @@ Usage:
 
 import json
 import os
+import re
 import sys
 import glob
 import time
+import heapq
+import pickle
 import hashlib
+from contextlib import suppress
+from functools import lru_cache
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from collections import Counter
 
 try:
+    import orjson
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    from shapely import STRtree
+    from shapely.geometry import shape
 except ImportError:
-    print("pip install requests")
+    print("pip install requests shapely orjson")
     sys.exit(1)
 
 # ─── Configuration ────────────────────────────────────────────────────
 
 BOUNDARY_DIR = "data/boundaries"
+PARSED_BOUNDARIES = os.path.join(BOUNDARY_DIR, ".parsed.pkl")  # shapely geometries by file mtime
 ROAD_DIR = "data/road"
-os.makedirs(ROAD_DIR, exist_ok=True)
+HTTP_CACHE_DIR = os.path.join(ROAD_DIR, ".http_cache")  # ETag-validated responses
+os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
 
 # IDOT ArcGIS layer endpoints (public, no auth required)
 # These are the Hub/OpenData FeatureServer endpoints
@@ -70,16 +88,108 @@ ALT_LAYER_PATTERNS = [
 PAGE_SIZE = 1000
 MAX_PAGES = 20
 
+# Attributes normalize_event reads; requested in place of outFields=*
+EVENT_FIELDS = (
+    "OBJECTID", "ObjectId", "FID",
+    "Route", "Route1", "ROUTE", "RoadName", "ROAD_NAME", "road",
+    "Direction", "DIRECTION",
+    "NearTown", "NEAR_TOWN", "Location", "LOCATION", "LocationDescription",
+    "County", "COUNTY",
+    "Description", "DESCRIPTION", "ConstructionType", "CONSTRUCTION_TYPE",
+    "ImpactOnTravel", "IMPACT_ON_TRAVEL", "TrafficAlert",
+    "LanesAffected", "LANES_AFFECTED",
+    "Status", "STATUS",
+    "StartDate", "START_DATE", "start", "EndDate", "END_DATE", "end",
+    "LastUpdated", "LAST_UPDATED", "EditDate",
+    "WebAddress", "WEB_ADDRESS", "url", "URL",
+)
+
+# Degrees (~100 m); boundaries sent to ArcGIS are simplified to this
+SIMPLIFY_TOLERANCE = 0.001
+
+# Illinois bounding box (padded) for the statewide layer fetch
+IL_ENVELOPE = {
+    "xmin": -91.6, "ymin": 36.9,
+    "xmax": -87.0, "ymax": 42.6,
+    "spatialReference": {"wkid": 4326}
+}
+
+# One pooled keep-alive session for every ArcGIS call, sized for the
+# concurrent queries above; retries throttled or transient 5xx responses
+_SESSION = requests.Session()
+_SESSION.headers["Accept-Encoding"] = "gzip"
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    # allowed_methods=None: the per-district queries are read-only POSTs
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=None),
+))
+
 
 # ─── ArcGIS Query Helpers ─────────────────────────────────────────────
 
-def arcgis_query_paged(url, geometry_json=None, where="1=1", out_fields="*",
-                       spatial_rel="esriSpatialRelIntersects"):
+def cached_get(url, params, timeout, method="GET"):
+    """
+    GET (or POST, for form-encoded params too long for a URL) a JSON endpoint,
+    revalidating against the last response for the same method+url+params with
+    If-None-Match / If-Modified-Since. A 304 returns the body cached from that
+    earlier 200. Returns None for any other non-200 status.
+    """
+    key = hashlib.sha1(f"{method} {url}?{json.dumps(params, sort_keys=True)}".encode()).hexdigest()
+    cache_path = os.path.join(HTTP_CACHE_DIR, f"{key}.json")
+
+    cached = None
+    headers = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, "rb") as f:
+            cached = orjson.loads(f.read())
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    payload = {"params": params} if method == "GET" else {"data": params}
+    resp = _SESSION.request(method, url, headers=headers, timeout=timeout, **payload)
+    if resp.status_code == 304 and cached is not None:
+        return cached["data"]
+    if resp.status_code != 200:
+        return None
+
+    data = orjson.loads(resp.content)
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if (etag or last_modified) and "error" not in data:
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps({"etag": etag, "last_modified": last_modified, "data": data}))
+        os.replace(tmp_path, cache_path)
+    return data
+
+
+@lru_cache(maxsize=None)
+def layer_out_fields(url):
+    """
+    outFields for a layer query URL: the EVENT_FIELDS the layer actually has,
+    per its metadata (ArcGIS rejects unknown field names). "*" if the
+    metadata can't be read.
+    """
+    try:
+        meta = cached_get(url.rsplit("/query", 1)[0], {"f": "json"}, timeout=30)
+        names = {field["name"] for field in meta.get("fields", [])}
+    except Exception:
+        return "*"
+    return ",".join(f for f in EVENT_FIELDS if f in names) or "*"
+
+
+def arcgis_iter_features(url, geometry_json=None, where="1=1", out_fields="*",
+                         spatial_rel="esriSpatialRelIntersects",
+                         geometry_type="esriGeometryPolygon"):
     """
-    Paged ArcGIS FeatureServer query. Returns list of features (GeoJSON).
+    Paged ArcGIS FeatureServer query. Yields features (GeoJSON) one page at a
+    time, so callers can consume a page before the next one is requested.
     Uses resultOffset/resultRecordCount for paging.
     """
-    all_features = []
     offset = 0
 
     for page in range(MAX_PAGES):
@@ -95,19 +205,23 @@ def arcgis_query_paged(url, geometry_json=None, where="1=1", out_fields="*",
 
         if geometry_json:
             params["geometry"] = json.dumps(geometry_json)
-            params["geometryType"] = "esriGeometryPolygon"
+            params["geometryType"] = geometry_type
             params["spatialRel"] = spatial_rel
             params["inSR"] = "4326"
 
         try:
-            resp = requests.get(url, params=params, timeout=60)
-            resp.raise_for_status()
-            data = resp.json()
+            data = cached_get(url, params, timeout=60)
+            if data is None:
+                raise ValueError("non-200 response")
         except Exception as e:
             print(f"    ⚠️  Query error at offset {offset}: {e}")
             break
 
         if "error" in data:
+            if out_fields != "*":
+                # Retry the page with every field before giving up
+                out_fields = "*"
+                continue
             print(f"    ⚠️  ArcGIS error: {data['error'].get('message', 'unknown')}")
             break
 
@@ -115,7 +229,7 @@ def arcgis_query_paged(url, geometry_json=None, where="1=1", out_fields="*",
         if not features:
             break
 
-        all_features.extend(features)
+        yield from features
         offset += PAGE_SIZE
 
         # Check if we got fewer than page size (last page)
@@ -124,7 +238,10 @@ def arcgis_query_paged(url, geometry_json=None, where="1=1", out_fields="*",
 
         time.sleep(0.3)  # Rate limit courtesy
 
-    return all_features
+
+def arcgis_query_paged(url, **query):
+    """Paged ArcGIS FeatureServer query. Returns list of features (GeoJSON)."""
+    return list(arcgis_iter_features(url, **query))
 
 
 def arcgis_count(url, geometry_json=None, where="1=1"):
@@ -141,7 +258,7 @@ def arcgis_count(url, geometry_json=None, where="1=1"):
         params["inSR"] = "4326"
 
     try:
-        resp = requests.get(url, params=params, timeout=30)
+        resp = _SESSION.get(url, params=params, timeout=30)
         data = resp.json()
         return data.get("count", -1)
     except:
@@ -150,69 +267,113 @@ def arcgis_count(url, geometry_json=None, where="1=1"):
 
 # ─── GeoJSON helpers ──────────────────────────────────────────────────
 
-def load_boundary(district_key):
-    """Load a district boundary GeoJSON file, return Esri-compatible geometry."""
+@lru_cache(maxsize=None)
+def _boundary_geometry(district_key):
+    """Parsed GeoJSON geometry of a district boundary file (read once per run)."""
     path = os.path.join(BOUNDARY_DIR, f"{district_key}.geojson")
     if not os.path.exists(path):
         return None
 
-    with open(path) as f:
-        feat = json.load(f)
+    with open(path, "rb") as f:
+        feat = orjson.loads(f.read())
 
-    geom = feat.get("geometry", {})
-    if geom.get("type") == "Polygon":
-        return {
-            "rings": geom["coordinates"],
-            "spatialReference": {"wkid": 4326}
-        }
-    elif geom.get("type") == "MultiPolygon":
-        # Flatten MultiPolygon to rings
-        rings = []
-        for polygon in geom["coordinates"]:
-            rings.extend(polygon)
-        return {
-            "rings": rings,
-            "spatialReference": {"wkid": 4326}
-        }
-    return None
+    geom = feat.get("geometry")
+    if not geom or not geom.get("coordinates"):
+        return None
+    return geom
 
 
-def bbox_from_geojson(district_key):
-    """Get bounding box from a district boundary (fallback for spatial query)."""
-    path = os.path.join(BOUNDARY_DIR, f"{district_key}.geojson")
-    if not os.path.exists(path):
+def load_boundary(district_key):
+    """
+    Load a district boundary GeoJSON file, return Esri-compatible geometry
+    simplified to SIMPLIFY_TOLERANCE for use as a query parameter.
+    """
+    geom = _boundary_geometry(district_key) or {}
+    if geom.get("type") not in ("Polygon", "MultiPolygon"):
         return None
 
-    with open(path) as f:
-        feat = json.load(f)
+    simple = shape(geom).simplify(SIMPLIFY_TOLERANCE, preserve_topology=True)
+    # Flatten MultiPolygon to rings
+    polygons = getattr(simple, "geoms", [simple])
+    rings = [
+        [list(xy) for xy in ring.coords]
+        for polygon in polygons
+        for ring in chain([polygon.exterior], polygon.interiors)
+    ]
+    return {
+        "rings": rings,
+        "spatialReference": {"wkid": 4326}
+    }
 
-    geom = feat.get("geometry", {})
-    coords = geom.get("coordinates", [])
 
-    # Flatten all coordinates
-    all_coords = []
-    def _flatten(c):
-        if isinstance(c[0], (int, float)):
-            all_coords.append(c)
-        else:
-            for item in c:
-                _flatten(item)
-    _flatten(coords)
+def load_boundary_shapes(district_keys):
+    """
+    Load district boundaries as shapely geometries, {district_key: geometry or None}.
+
+    Parsed geometries are pickled to PARSED_BOUNDARIES with each file's mtime,
+    so boundaries that haven't changed since the last run skip the GeoJSON parse.
+    """
+    try:
+        with open(PARSED_BOUNDARIES, "rb") as f:
+            parsed = pickle.load(f)
+    except Exception:
+        parsed = {}
+
+    shapes = {}
+    changed = False
+    for key in district_keys:
+        path = os.path.join(BOUNDARY_DIR, f"{key}.geojson")
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        cached = parsed.get(key)
+        if cached and cached[0] == mtime:
+            shapes[key] = cached[1]
+            continue
+
+        geom = _boundary_geometry(key)
+        shapes[key] = shape(geom) if geom else None
+        parsed[key] = (mtime, shapes[key])
+        changed = True
+
+    if changed:
+        tmp_path = f"{PARSED_BOUNDARIES}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(parsed, f)
+        os.replace(tmp_path, PARSED_BOUNDARIES)
+    return shapes
 
-    if not all_coords:
+
+def bbox_from_geojson(district_key):
+    """Get bounding box from a district boundary (fallback for spatial query)."""
+    geom = _boundary_geometry(district_key)
+    if not geom:
         return None
 
-    lons = [c[0] for c in all_coords]
-    lats = [c[1] for c in all_coords]
+    xmin, ymin, xmax, ymax = shape(geom).bounds
     return {
-        "xmin": min(lons), "ymin": min(lats),
-        "xmax": max(lons), "ymax": max(lats),
+        "xmin": xmin, "ymin": ymin,
+        "xmax": xmax, "ymax": ymax,
         "spatialReference": {"wkid": 4326}
     }
 
 
 # ─── Normalization ────────────────────────────────────────────────────
 
+# Checked in order; first match wins
+STATUS_RX = {
+    "active": re.compile(r"active|in progress|current|open"),
+    "planned": re.compile(r"planned|upcoming|scheduled"),
+    "ended": re.compile(r"ended|completed|closed"),
+}
+
+def parse_date(val):
+    """IDOT dates are epoch milliseconds or strings; returns an ISO/stripped string or None."""
+    if isinstance(val, str):
+        return val.strip()
+    if isinstance(val, (int, float)) and val > 1e12:
+        return datetime.fromtimestamp(val / 1000, tz=timezone.utc).isoformat()
+    return None
+
+
 def normalize_event(raw_props, layer_type, geometry=None):
     """
     Normalize raw ArcGIS feature properties into a standard RoadEvent.
@@ -249,24 +410,7 @@ def normalize_event(raw_props, layer_type, geometry=None):
 
     # Status normalization
     raw_status = (p.get("Status") or p.get("STATUS") or "").lower()
-    if any(w in raw_status for w in ["active", "in progress", "current", "open"]):
-        status = "active"
-    elif any(w in raw_status for w in ["planned", "upcoming", "scheduled"]):
-        status = "planned"
-    elif any(w in raw_status for w in ["ended", "completed", "closed"]):
-        status = "ended"
-    else:
-        status = "unknown"
-
-    # Date parsing (IDOT uses epoch milliseconds or date strings)
-    def parse_date(val):
-        if val is None:
-            return None
-        if isinstance(val, (int, float)) and val > 1e12:
-            return datetime.fromtimestamp(val / 1000, tz=timezone.utc).isoformat()
-        if isinstance(val, str):
-            return val.strip()
-        return None
+    status = next((k for k, rx in STATUS_RX.items() if rx.search(raw_status)), "unknown")
 
     start = parse_date(p.get("StartDate") or p.get("START_DATE") or p.get("start"))
     end = parse_date(p.get("EndDate") or p.get("END_DATE") or p.get("end"))
@@ -285,11 +429,17 @@ def normalize_event(raw_props, layer_type, geometry=None):
         "https://www.gettingaroundillinois.com/"
     )
 
-    # Unique ID for dedup
+    # Unique ID for dedup; without an object id, hash the fields that identify the event
     obj_id = p.get("OBJECTID") or p.get("ObjectId") or p.get("FID") or ""
-    unique_id = f"{layer_type}:{obj_id}" if obj_id else hashlib.md5(
-        json.dumps(p, sort_keys=True, default=str).encode()
-    ).hexdigest()[:12]
+    if obj_id:
+        unique_id = f"{layer_type}:{obj_id}"
+    else:
+        identity = (road, direction, location_text, county, description, start, end, lat, lon)
+        if any(identity):
+            key = repr((layer_type, *identity))
+        else:
+            key = f"{layer_type}:{json.dumps(p, sort_keys=True, default=str)}"
+        unique_id = hashlib.blake2b(key.encode(), digest_size=6).hexdigest()
 
     return {
         "id": unique_id,
@@ -315,7 +465,21 @@ def normalize_event(raw_props, layer_type, geometry=None):
 
 # ─── Scoring ──────────────────────────────────────────────────────────
 
-def score_event(event):
+TYPE_SCORES = {"closure": 60, "restriction": 40, "construction": 25}
+STATUS_SCORES = {"active": 20}
+
+ROAD_PREFIX_RX = re.compile(r"(I|US|IL)[- ]")
+ROAD_PREFIX_SCORES = {"I": 15, "US": 10, "IL": 5}
+
+# Only the highest-scoring keyword found counts
+KEYWORD_SCORES = {
+    "road closed": 20, "all lanes": 20,
+    "closed": 10,
+    "one lane": 5, "shoulder": 5,
+}
+KEYWORD_RX = re.compile("|".join(map(re.escape, KEYWORD_SCORES)))
+
+def score_event(event, now):
     """
     Deterministic severity score for ranking. Higher = more important.
 
@@ -325,71 +489,144 @@ def score_event(event):
     If "all lanes closed" / "road closed": +20
     If "one lane" / "shoulder": +5
     """
-    score = 0
-    t = event.get("type", "")
-    if t == "closure":
-        score += 60
-    elif t == "restriction":
-        score += 40
-    elif t == "construction":
-        score += 25
-
-    if event.get("status") == "active":
-        score += 20
-
-    road = (event.get("road") or "").upper()
-    if road.startswith("I-") or road.startswith("I "):
-        score += 15
-    elif road.startswith("US-") or road.startswith("US "):
-        score += 10
-    elif road.startswith("IL-") or road.startswith("IL "):
-        score += 5
+    score = TYPE_SCORES.get(event.get("type", ""), 0)
+    score += STATUS_SCORES.get(event.get("status"), 0)
+
+    m = ROAD_PREFIX_RX.match((event.get("road") or "").upper())
+    if m:
+        score += ROAD_PREFIX_SCORES[m.group(1)]
 
     lanes = (event.get("lanes") or "").lower()
     desc = (event.get("description") or "").lower()
     combined = lanes + " " + desc
 
-    if "road closed" in combined or "all lanes" in combined:
-        score += 20
-    elif "closed" in combined:
-        score += 10
-    elif "one lane" in combined or "shoulder" in combined:
-        score += 5
+    score += max((KEYWORD_SCORES[hit] for hit in KEYWORD_RX.findall(combined)), default=0)
 
-    # Imminent end date bonus
-    if event.get("end"):
-        try:
-            end_str = event["end"]
-            if "T" in str(end_str):
-                end_dt = datetime.fromisoformat(end_str.replace("Z", "+00:00"))
-                now = datetime.now(timezone.utc)
-                hours_left = (end_dt - now).total_seconds() / 3600
-                if 0 < hours_left < 48:
-                    score += 10
-        except:
-            pass
+    # Imminent end date bonus (date-only strings are naive and fail the subtraction)
+    end_str = event.get("end")
+    if isinstance(end_str, str) and end_str[:4].isdigit():
+        with suppress(ValueError, TypeError):
+            end_dt = datetime.fromisoformat(end_str.replace("Z", "+00:00"))
+            hours_left = (end_dt - now).total_seconds() / 3600
+            if 0 < hours_left < 48:
+                score += 10
 
     event["severity"] = score
     return event
 
 
-# ─── District Builder ─────────────────────────────────────────────────
+def score_events(events, now):
+    """Score a batch of events in place against the same clock reading."""
+    for event in events:
+        score_event(event, now)
+    return events
+
 
-def build_district(district_key, verbose=True):
+# ─── Layer Fetching ───────────────────────────────────────────────────
+
+def fetch_layer(layer_name, url, params):
     """
-    Build road event cache for a single district.
-    Returns the district data dict.
+    Run one layer's spatial query, falling back to ALT_LAYER_PATTERNS.
+    Sent as a POST since the boundary geometry can outgrow a URL.
+    Returns (features, error message or None).
     """
-    if verbose:
-        print(f"\n🔍 Building: {district_key}")
+    features = []
+    error = None
+    out_fields = layer_out_fields(url)
+    try:
+        data = cached_get(url, {**params, "outFields": out_fields}, timeout=60, method="POST")
+        if data and "error" in data and out_fields != "*":
+            # Retry with every field before trying the alternates
+            data = cached_get(url, params, timeout=60, method="POST")
+        if data and "error" not in data:
+            features = data.get("features", [])
+    except Exception as e:
+        error = e
+
+    # Try alternate URLs if primary failed
+    if not features:
+        for alt_pattern in ALT_LAYER_PATTERNS:
+            alt_url = alt_pattern.format(name=layer_name.title().replace("s", ""))
+            try:
+                data = cached_get(alt_url, params, timeout=30, method="POST")
+                if data and "error" not in data:
+                    features = data.get("features", [])
+                    if features:
+                        break
+            except:
+                pass
+
+    return features, error
+
+
+def fetch_layer_statewide(layer_name, url):
+    """
+    Page through every feature of a layer inside IL_ENVELOPE, falling back to
+    ALT_LAYER_PATTERNS. Returns (features, STRtree over their geometries).
+    """
+    alt_name = layer_name.title().replace("s", "")
+    urls = chain([url], (alt_pattern.format(name=alt_name) for alt_pattern in ALT_LAYER_PATTERNS))
+
+    features, geoms = [], []
+    for layer_url in urls:
+        found = False
+        for feat in arcgis_iter_features(layer_url, geometry_json=IL_ENVELOPE,
+                                         out_fields=layer_out_fields(layer_url),
+                                         geometry_type="esriGeometryEnvelope"):
+            found = True
+            # Features without geometry can't fall inside any district
+            if feat.get("geometry"):
+                features.append(feat)
+                geoms.append(shape(feat["geometry"]))
+        if found:
+            break
+
+    return features, STRtree(geoms)
+
 
-    # Load boundary
+def fetch_statewide_layers():
+    """Fetch and index all LAYERS in parallel. Returns {layer_name: (features, tree)}."""
+    with ThreadPoolExecutor(max_workers=len(LAYERS)) as pool:
+        futures = {
+            layer_name: pool.submit(fetch_layer_statewide, layer_name, layer_info["url"])
+            for layer_name, layer_info in LAYERS.items()
+        }
+    return {layer_name: future.result() for layer_name, future in futures.items()}
+
+
+def assign_districts(layers, district_keys):
+    """
+    Match the statewide layers to every district with one bulk STRtree query
+    per layer. Returns {district_key: {layer_name: (features, None)}}; a
+    district without a usable boundary maps to {}.
+    """
+    boundaries = load_boundary_shapes(district_keys)
+    keys = [key for key, boundary in boundaries.items() if boundary is not None]
+
+    assigned = {key: {} for key in district_keys}
+    for key in keys:
+        assigned[key] = {layer_name: ([], None) for layer_name in layers}
+    if not keys:
+        return assigned
+
+    for layer_name, (features, tree) in layers.items():
+        # (district index, feature index) pairs for every intersecting combination
+        district_idx, feature_idx = tree.query([boundaries[k] for k in keys], predicate="intersects")
+        for d, i in sorted(zip(district_idx.tolist(), feature_idx.tolist())):
+            assigned[keys[d]][layer_name][0].append(features[i])
+
+    return assigned
+
+
+def query_district_layers(district_key):
+    """
+    Server-side spatial intersect of one district against every layer.
+    Returns {layer_name: (features, error)}, or None if there is no boundary.
+    """
     boundary = load_boundary(district_key)
     if not boundary:
         bbox = bbox_from_geojson(district_key)
         if not bbox:
-            if verbose:
-                print(f"  ⚠️  No boundary file for {district_key}")
             return None
         geometry_param = bbox
         geom_type = "esriGeometryEnvelope"
@@ -397,78 +634,76 @@ def build_district(district_key, verbose=True):
         geometry_param = boundary
         geom_type = "esriGeometryPolygon"
 
-    all_events = []
-    counts = {"closures": 0, "restrictions": 0, "construction": 0}
+    params = {
+        "where": "1=1",
+        "outFields": "*",
+        "outSR": "4326",
+        "f": "geojson",
+        "geometry": json.dumps(geometry_param),
+        "geometryType": geom_type,
+        "spatialRel": "esriSpatialRelIntersects",
+        "inSR": "4326",
+        "resultRecordCount": PAGE_SIZE,
+        "returnGeometry": "true",
+    }
 
-    for layer_name, layer_info in LAYERS.items():
-        url = layer_info["url"]
-        layer_type = layer_info["type"]
+    with ThreadPoolExecutor(max_workers=len(LAYERS)) as pool:
+        futures = {
+            layer_name: pool.submit(fetch_layer, layer_name, layer_info["url"], params)
+            for layer_name, layer_info in LAYERS.items()
+        }
+    return {layer_name: future.result() for layer_name, future in futures.items()}
 
-        if verbose:
-            print(f"  📡 Querying {layer_name}...", end=" ")
 
-        # First try spatial intersect
-        params = {
-            "where": "1=1",
-            "outFields": "*",
-            "outSR": "4326",
-            "f": "geojson",
-            "geometry": json.dumps(geometry_param),
-            "geometryType": geom_type,
-            "spatialRel": "esriSpatialRelIntersects",
-            "inSR": "4326",
-            "resultRecordCount": PAGE_SIZE,
-            "returnGeometry": "true",
-        }
+# ─── District Builder ─────────────────────────────────────────────────
 
-        features = []
-        try:
-            resp = requests.get(url, params=params, timeout=60)
-            if resp.status_code == 200:
-                data = resp.json()
-                if "error" not in data:
-                    features = data.get("features", [])
-        except Exception as e:
-            if verbose:
-                print(f"error: {e}")
+def build_district(district_key, layer_results=None, verbose=True):
+    """
+    Build road event cache for a single district.
 
-        # Try alternate URLs if primary failed
-        if not features:
-            for alt_pattern in ALT_LAYER_PATTERNS:
-                alt_url = alt_pattern.format(name=layer_name.title().replace("s", ""))
-                try:
-                    resp = requests.get(alt_url, params=params, timeout=30)
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        if "error" not in data:
-                            features = data.get("features", [])
-                            if features:
-                                break
-                except:
-                    pass
+    layer_results is this district's entry from assign_districts(); when
+    omitted the district is queried against the server directly.
+    Returns the district data dict.
+    """
+    log = [f"\n🔍 Building: {district_key}"]
 
+    matched = layer_results is not None
+    if not matched:
+        layer_results = query_district_layers(district_key)
+
+    if not layer_results:
         if verbose:
-            print(f"{len(features)} features")
+            log.append(f"  ⚠️  No boundary file for {district_key}")
+            print("\n".join(log))
+        return None
+
+    now = datetime.now(timezone.utc)
+    all_events = []
+    counts = {"closures": 0, "restrictions": 0, "construction": 0}
+
+    for layer_name, layer_info in LAYERS.items():
+        features, error = layer_results[layer_name]
+        note = f"error: {error}, " if error else ""
+        verb = "Matching" if matched else "Querying"
+        log.append(f"  📡 {verb} {layer_name}... {note}{len(features)} features")
 
         counts[layer_name] = len(features)
 
         for feat in features:
-            event = normalize_event(
+            all_events.append(normalize_event(
                 feat.get("properties", {}),
-                layer_type,
+                layer_info["type"],
                 feat.get("geometry")
-            )
-            event = score_event(event)
-            all_events.append(event)
+            ))
 
-        time.sleep(0.5)  # Rate limit courtesy
+    score_events(all_events, now)
 
     # Sort by severity (descending)
     all_events.sort(key=lambda e: e["severity"], reverse=True)
 
     result = {
         "district_key": district_key,
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "generated_at": now.isoformat(),
         "counts": counts,
         "total": sum(counts.values()),
         "top": all_events[:10],  # Top 10 by severity
@@ -476,11 +711,12 @@ def build_district(district_key, verbose=True):
     }
 
     out_path = os.path.join(ROAD_DIR, f"{district_key}.json")
-    with open(out_path, "w") as f:
-        json.dump(result, f, indent=2, default=str)
+    with open(out_path, "wb") as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str))
 
     if verbose:
-        print(f"  ✅ Saved {len(all_events)} events → {out_path}")
+        log.append(f"  ✅ Saved {len(all_events)} events → {out_path}")
+        print("\n".join(log))
 
     return result
 
@@ -492,8 +728,8 @@ def build_statewide_senators():
     """
     print("\n🏛️  Building statewide senator aggregate (US-IL-SEN)...")
 
-    all_events = []
-    seen_ids = set()
+    events = {}  # id -> first occurrence, in district order
+    type_counts = Counter()
 
     # Load all existing district caches
     for path in sorted(glob.glob(os.path.join(ROAD_DIR, "*.json"))):
@@ -501,22 +737,19 @@ def build_statewide_senators():
         if key == "US-IL-SEN":
             continue
         try:
-            with open(path) as f:
-                data = json.load(f)
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
             for event in data.get("items", []):
                 eid = event.get("id", "")
-                if eid and eid not in seen_ids:
-                    seen_ids.add(eid)
+                if eid and eid not in events:
                     event["_source_district"] = key
-                    all_events.append(event)
+                    events[eid] = event
+                    type_counts[event.get("type", "unknown")] += 1
         except:
             pass
 
-    # Sort by severity
-    all_events.sort(key=lambda e: e.get("severity", 0), reverse=True)
-
-    # Count by type
-    type_counts = Counter(e.get("type", "unknown") for e in all_events)
+    # Only the top 50 are kept, so there's no need to sort everything
+    top_events = heapq.nlargest(50, events.values(), key=lambda e: e.get("severity", 0))
 
     result = {
         "district_key": "US-IL-SEN",
@@ -526,22 +759,26 @@ def build_statewide_senators():
             "restrictions": type_counts.get("restriction", 0),
             "construction": type_counts.get("construction", 0),
         },
-        "total": len(all_events),
-        "top": all_events[:5],  # Top 5 statewide
-        "items": all_events[:50],  # Keep top 50 for browsing
+        "total": len(events),
+        "top": top_events[:5],  # Top 5 statewide
+        "items": top_events,  # Keep top 50 for browsing
     }
 
     out_path = os.path.join(ROAD_DIR, "US-IL-SEN.json")
-    with open(out_path, "w") as f:
-        json.dump(result, f, indent=2, default=str)
+    with open(out_path, "wb") as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str))
 
-    print(f"  ✅ {len(all_events)} total events, top 5 saved → {out_path}")
+    print(f"  ✅ {len(events)} total events, top 5 saved → {out_path}")
     return result
 
 
 # ─── Main ─────────────────────────────────────────────────────────────
 
-def main():
+def main(argv=None):
+    """CLI entry point; argv defaults to sys.argv[1:]."""
+    if argv is None:
+        argv = sys.argv[1:]
+
     print("=" * 60)
     print("IDOT Dashboard — Road Events Fetcher")
     print(f"Time: {datetime.now().isoformat()}")
@@ -557,7 +794,7 @@ def main():
     print(f"\n📂 Found {len(boundary_files)} boundary files")
 
     # Parse args
-    target = sys.argv[1] if len(sys.argv) > 1 else None
+    target = argv[0] if argv else None
 
     if target == "--statewide-only":
         build_statewide_senators()
@@ -567,11 +804,16 @@ def main():
         # Build single district
         build_district(target)
     else:
-        # Build all districts
-        for bf in sorted(boundary_files):
-            key = os.path.basename(bf).replace(".geojson", "")
-            build_district(key)
-            time.sleep(1)  # Rate limit between districts
+        # Build all districts against one statewide fetch per layer
+        print("\n📡 Fetching statewide layers...")
+        layers = fetch_statewide_layers()
+        for layer_name, (features, _) in layers.items():
+            print(f"  {layer_name}: {len(features)} features")
+
+        keys = [os.path.basename(bf).replace(".geojson", "") for bf in sorted(boundary_files)]
+        assigned = assign_districts(layers, keys)
+        for key in keys:
+            build_district(key, assigned[key])
 
     # Always rebuild senator aggregate after district builds
     build_statewide_senators()
@@ -3,79 +3,189 @@
 setup_pipeline.py — One-command setup for the IDOT dashboard data pipeline.
 
 Usage:
-  python setup_pipeline.py          # Full setup: boundaries + road events
+  python setup_pipeline.py          # Full setup: boundaries + road events + AV map
   python setup_pipeline.py refresh  # Just refresh road events (daily cron)
+  python setup_pipeline.py refresh --force  # ...even if they were just fetched
 
-Requires: pip install requests
+Requires: pip install requests orjson shapely folium (installed if missing)
 """
 
+import importlib
+import importlib.util
+import shlex
 import subprocess
 import sys
 import os
+import time
+import traceback
+
+# Imported by the pipeline scripts, not by this one
+PIPELINE_DEPS = ("requests", "orjson", "shapely", "folium")
+# Holds the interpreter path once all PIPELINE_DEPS were found for it
+DEPS_MARKER = ".setup_pipeline_deps_ok"
+
+# Fewer boundary files than this means the boundary fetch hasn't been run
+MIN_BOUNDARY_FILES = 10
+BOUNDARY_DIR = "data/boundaries"
+
+# refresh is skipped if road events were written more recently than this
+ROAD_DIR = "data/road"
+REFRESH_MIN_AGE = 10 * 60  # seconds
+
+# Steps run by each mode: (script, description, argv for its main() or None).
+# Full setup also fetches boundaries first if they're missing.
+MODES = {
+    "full": [("fetch_road_events", "Fetching road events from IDOT ArcGIS", []),
+             ("build_av_map", "Pre-rendering the AV Policy map", None)],
+    "refresh": [("fetch_road_events", "Refreshing road events", [])],
+    "boundaries": [("fetch_boundaries", "Fetching boundaries only", None)],
+}
+
+
+def run(script, desc, args=None):
+    """
+    Run a pipeline script's main() in this interpreter instead of a fresh
+    python process; args, if given, is passed as its argv. Returns the exit code.
+    """
+    call = f"{script}.main()" if args is None else f"{script}.main({args!r})"
+    print(f"\n{'─'*50}\n▶ {desc}\n  → {call}\n{'─'*50}")
+    try:
+        module = importlib.import_module(script)
+        if args is None:
+            module.main()
+        else:
+            module.main(args)
+        returncode = 0
+    except SystemExit as e:
+        # sys.exit() is success, sys.exit("message") a failure whose message
+        # the interpreter would have printed
+        if isinstance(e.code, int) or e.code is None:
+            returncode = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            returncode = 1
+    except Exception:
+        # Same traceback the script would have printed as its own process
+        traceback.print_exc()
+        print(f"  ❌ {desc} failed")
+        returncode = 1
+    if returncode != 0:
+        print(f"  ⚠️  {desc} returned non-zero exit code: {returncode}")
+    return returncode
+
+
+def count_boundary_files():
+    """Count .geojson files in BOUNDARY_DIR, stopping at MIN_BOUNDARY_FILES."""
+    existing = 0
+    try:
+        with os.scandir(BOUNDARY_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.geojson'):
+                    existing += 1
+                    if existing >= MIN_BOUNDARY_FILES:
+                        break
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return existing
 
 
-def run(cmd, desc):
-    print(f"\n{'─'*50}")
-    print(f"▶ {desc}")
-    print(f"  $ {cmd}")
-    print(f"{'─'*50}")
-    result = subprocess.run(cmd, shell=True)
-    if result.returncode != 0:
-        print(f"  ⚠️  {desc} returned non-zero exit code: {result.returncode}")
-    return result.returncode
-
-
-def main():
-    mode = sys.argv[1] if len(sys.argv) > 1 else "full"
+def missing_deps():
+    """PIPELINE_DEPS that can't be found (find_spec locates them without importing)."""
+    return [name for name in PIPELINE_DEPS if importlib.util.find_spec(name) is None]
 
-    print("=" * 60)
-    print("IDOT Dashboard — Pipeline Setup")
-    print("=" * 60)
 
-    # Check dependencies
+def deps_marked_ok(py):
+    """True if an earlier run already found every dependency for this interpreter."""
     try:
-        import requests
-    except ImportError:
-        print("\n📦 Installing requests...")
-        subprocess.run([sys.executable, "-m", "pip", "install", "requests", "--break-system-packages"])
+        with open(DEPS_MARKER) as f:
+            return f.read() == py
+    except OSError:
+        return False
 
-    if mode == "full":
-        # Step 1: Fetch boundaries (only need to do this once)
-        boundary_dir = "data/boundaries"
-        existing = len([f for f in os.listdir(boundary_dir) if f.endswith('.geojson')]) if os.path.exists(boundary_dir) else 0
 
-        if existing < 10:
-            run(f"{sys.executable} fetch_boundaries.py", "Fetching district boundaries")
-        else:
-            print(f"\n✅ {existing} boundary files already exist, skipping download")
-            print("   (delete data/boundaries/ to re-fetch)")
+def newest_road_event_mtime():
+    """mtime of the most recently written road event file, or 0 if there are none."""
+    newest = 0.0
+    try:
+        with os.scandir(ROAD_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.json'):
+                    newest = max(newest, entry.stat(follow_symlinks=False).st_mtime)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return newest
 
-        # Step 2: Fetch road events
-        run(f"{sys.executable} fetch_road_events.py", "Fetching road events from IDOT ArcGIS")
 
-    elif mode == "refresh":
-        # Just refresh road events (for daily cron)
-        run(f"{sys.executable} fetch_road_events.py", "Refreshing road events")
+def main():
+    args = [a for a in sys.argv[1:] if a != "--force"]
+    force = len(args) < len(sys.argv) - 1
+    mode = args[0] if args else "full"
+    py = sys.executable
+    cwd = os.getcwd()
 
-    elif mode == "boundaries":
-        run(f"{sys.executable} fetch_boundaries.py", "Fetching boundaries only")
+    print(f"{'='*60}\nIDOT Dashboard — Pipeline Setup\n{'='*60}")
 
-    else:
+    steps = MODES.get(mode)
+    if steps is None:
         print(f"Unknown mode: {mode}")
-        print("Usage: python setup_pipeline.py [full|refresh|boundaries]")
+        print(f"Usage: python setup_pipeline.py [{'|'.join(MODES)}]")
         sys.exit(1)
 
-    print("\n" + "=" * 60)
-    print("✅ Pipeline complete!")
-    print("")
-    print("Next steps:")
-    print("  1. Check data/boundaries/ for .geojson files")
-    print("  2. Check data/road/ for district event .json files")
-    print("  3. Run the dashboard: streamlit run app.py")
-    print("")
-    print("For daily refresh, add to cron:")
-    print(f"  0 6 * * * cd {os.getcwd()} && {sys.executable} setup_pipeline.py refresh")
-    print("=" * 60)
+    if mode == "refresh" and not force:
+        age = time.time() - newest_road_event_mtime()
+        if age < REFRESH_MIN_AGE:
+            print(f"\n✅ Road events were fetched {age / 60:.0f} min ago, skipping refresh")
+            print("   (pass --force to refresh anyway)")
+            return
+
+    # Check dependencies on every run, marker or not: a venv rebuilt at the
+    # same path keeps the marker. Only full setup installs them; refresh runs
+    # from cron and should just fail.
+    missing = missing_deps()
+    if missing and mode != "full":
+        print(f"\n❌ Missing dependencies: {' '.join(missing)}")
+        print(f"   Run: python setup_pipeline.py   (or: pip install {' '.join(missing)})")
+        sys.exit(2)
+    if missing:
+        print(f"\n📦 Installing {' '.join(missing)}...")
+        subprocess.run([py, "-m", "pip", "install", *missing, "--break-system-packages",
+                        "--quiet", "--disable-pip-version-check", "--no-input"])
+        importlib.invalidate_caches()
+        missing = missing_deps()
+    if not missing and not deps_marked_ok(py):
+        with open(DEPS_MARKER, "w") as f:
+            f.write(py)
+
+    if mode == "full":
+        # Boundaries only need to be fetched once
+        existing = count_boundary_files()
+        if existing < MIN_BOUNDARY_FILES:
+            steps = [("fetch_boundaries", "Fetching district boundaries", None), *steps]
+        else:
+            print(f"\n✅ {existing}+ boundary files already exist, skipping download")
+            print(f"   (delete {BOUNDARY_DIR}/ to re-fetch)")
+
+    # Worst exit code across steps, so cron sees a failed fetch
+    rc = 0
+    for script, desc, args in steps:
+        rc = max(rc, run(script, desc, args))
+
+    status = "✅ Pipeline complete!" if rc == 0 else f"⚠️  Pipeline finished with errors (exit code {rc})"
+
+    # One write for the whole footer
+    print(f"""
+{'='*60}
+{status}
+
+Next steps:
+  1. Check data/boundaries/ for .geojson files
+  2. Check data/road/ for district event .json files
+  3. Run the dashboard: streamlit run app.py
+
+For daily refresh, add to cron:
+  0 6 * * * cd {shlex.quote(cwd)} && {shlex.quote(py)} setup_pipeline.py refresh
+{'='*60}""")
+    sys.exit(rc)
 
 
 if __name__ == "__main__":